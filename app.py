@@ -7,10 +7,10 @@ import matplotlib
 matplotlib.use('Agg')
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from scipy.fft import fft, fftshift, fftfreq
 import pandas as pd
+from io import BytesIO
+from matplotlib.figure import Figure
 
 try:
     from qiskit.quantum_info import Statevector, state_fidelity
@@ -28,32 +28,20 @@ import subprocess
 import sys
 import os
 
-from pulse_comparison import (
-    create_phi_pulse,
-    create_gaussian_pulse,
-    create_drag_pulse,
-    create_square_pulse,
-    create_sinc_pulse,
-    create_raised_cosine_pulse,
-    create_gaussian_square_pulse,
-    compute_leakage_metrics,
+from result_cache import ResultCache, CODE_FILES
+from dataflow import pulse_graph, SHAPE_PARAMS
+from data_export import FORMATS, available_formats, file_name, table_bytes, pulse_table, sweep_archive_bytes
+from pareto_search import search_all, front_records
+from bloch_trajectory import (
+    states_to_bloch_vectors,
+    simulate_trajectories,
 )
+from pulse_calibration import FULL_SCALE_RABI_MHZ, resonant_table
+from gate_length_sweep import IBM_RANGE_NS, alignment_scores, cached_sweep, best_durations
+from warmup import StageMemo, Warmer, start_disk_warmup
+from bloch_render import render_bloch_png, render_bloch_grid_png, trajectory_hash
 
 
-def create_gaussian_custom(duration, sigma_divisor):
-    sigma = duration / sigma_divisor
-    t = np.linspace(-duration/2, duration/2, duration)
-    s = np.exp(-(t**2) / (2 * sigma**2))
-    return s / np.max(np.abs(s))
-
-
-def create_drag_custom(duration, beta):
-    sigma = duration / 5
-    t = np.linspace(-duration/2, duration/2, duration)
-    g = np.exp(-(t**2) / (2 * sigma**2))
-    d = -t / (sigma**2) * g
-    return (g + beta * d) / np.max(np.abs(g + beta * d))
-
 st.set_page_config(page_title="Phi Pulse vs All Quantum Pulses", page_icon="🔬", layout="wide")
 
 st.title("🔬 Phi Pulse vs All Quantum Pulse Types")
@@ -135,14 +123,21 @@ st.sidebar.subheader("Plot options (colored lines)")
 line_width = st.sidebar.slider("Line width", 1.0, 5.0, 2.0, 0.5, help="Thickness of lines in time/frequency plots")
 psd_ylim = st.sidebar.slider("PSD y-axis limit (dB)", -150, 20, -100, 10, help="Frequency plot vertical range")
 target_angle_deg = st.sidebar.slider("Bloch: target angle (deg)", 0, 180, 90, 15)
+bloch_resolution = st.sidebar.slider("Bloch: trajectory points", 10, 500, 50, 10, help="Points per trajectory; values >= duration use every sample")
 bloch_show_all = st.sidebar.checkbox("Bloch: show all pulses (7 spheres)", True, help="Show Bloch sphere for every pulse type")
 PULSE_NAMES = ["Phi (Golden Ratio)", "Gaussian", "DRAG", "Square", "Sinc", "Raised Cosine", "Gaussian Square"]
+bloch_combined = st.sidebar.checkbox("Bloch: one combined figure", False, help="Draw all spheres as subplots of a single image")
 bloch_single_pulse = st.sidebar.selectbox("Bloch: single pulse (if not showing all)", PULSE_NAMES, index=0, disabled=bloch_show_all)
 
 with st.sidebar.expander("Advanced: Gaussian & DRAG"):
     sigma_factor = st.slider("Gaussian sigma (duration / x)", 2, 15, 5, 1)
     drag_beta = st.slider("DRAG beta", 0.0, 0.5, 0.1, 0.05)
 
+with st.sidebar.expander("Advanced: AWG / line distortion"):
+    line_filter_on = st.checkbox("Apply AWG low-pass (Butterworth)", False,
+                                 help="Run spectra, metrics and Bloch simulation on the filtered waveform")
+    line_cutoff = st.slider("Low-pass cutoff (GHz)", 0.05, 0.45, 0.3, 0.05, disabled=not line_filter_on)
+
 PHI = (1 + np.sqrt(5)) / 2
 st.sidebar.write(f"**Phi**: {PHI:.6f}")
 
@@ -158,6 +153,17 @@ ibm_mode = st.sidebar.checkbox(
 st.session_state.ibm_mode = ibm_mode
 if ibm_mode:
     st.sidebar.caption("Single-qubit gates on IBM hardware use Gaussian/DRAG at ~10–50 ns. Current duration (samples) = duration in ns at 1 GS/s.")
+gate_range = st.sidebar.slider("Gate-length range (ns)", 10, 500, IBM_RANGE_NS, 5, disabled=not ibm_mode,
+                               help="Range swept for the alignment curves (10–50 ns for IBM; set another backend's gate lengths here)")
+
+st.sidebar.subheader("Downloads")
+download_format = st.sidebar.selectbox("Download format", available_formats(), format_func=str.upper,
+                                       help="Files are generated when a download button is clicked")
+download_mime = FORMATS[download_format][1]
+
+st.sidebar.subheader("Pareto fronts")
+show_pareto = st.sidebar.checkbox("Show energy / leakage / duration Pareto fronts", False,
+                                  help="Adaptive search over each family's parameters and 10–500 ns (cached after the first run)")
 
 st.sidebar.divider()
 with st.sidebar.expander("Disclaimer & Philosophy", expanded=False):
@@ -209,111 +215,152 @@ with st.sidebar.expander("Disclaimer & Philosophy", expanded=False):
 dt_ns = 1e-9  # seconds per sample
 
 
-def compute_fft(samples, dt_sec=1e-9):
-    """Compute FFT. Returns (freq_GHz, psd_dB) for 1 GS/s sample rate."""
-    n = len(samples)
-    yf = fft(samples)
-    xf_Hz = fftfreq(n, dt_sec)
-    yf_shifted = fftshift(yf)
-    xf_shifted = fftshift(xf_Hz)
-    xf_GHz = xf_shifted / 1e9
-    psd = 20 * np.log10(np.abs(yf_shifted) + 1e-15)
-    psd = psd - np.max(psd)
-    return xf_GHz, psd
+# 12 in wide figures stay under Streamlit's 1460 px content width, so st.image serves the PNG bytes as-is
+# instead of decoding, resizing and re-encoding them on every rerun. Fixed margins replace
+# bbox_inches='tight' / tight_layout, each of which costs an extra full draw.
+FIG_DPI = 120
+FIG_MARGINS = dict(left=0.06, right=0.99, bottom=0.1, top=0.93)
+
+
+def fig_to_png(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=FIG_DPI)
+    return buf.getvalue()
+
+
+@st.cache_resource
+def get_result_cache():
+    """One shared disk-backed cache per server process (IBM sweeps, Bloch images)."""
+    return ResultCache()
 
 
-def simulate_quantum_evolution(pulse_samples, target_angle=np.pi/2):
+result_cache = get_result_cache()
+# Bloch images are keyed by trajectory content, so only the renderer versions them.
+BLOCH_CODE_FILES = ['bloch_render.py']
+
+
+@st.cache_resource
+def get_disk_warmup():
     """
-    Simulate quantum state evolution under the pulse.
-    Returns the final quantum state and intermediate states for Bloch sphere visualization.
+    Future of the disk warm-up (default IBM sweep): runs once per server process on a low-priority
+    background thread, so page renders never wait for it.
     """
-    pulse_energy = np.sum(np.abs(pulse_samples)**2)
-    pulse_duration = len(pulse_samples)
-    effective_angle = target_angle * (pulse_energy / pulse_duration) / 0.5
-
-    initial_state = np.array([1, 0], dtype=complex)
-    states = [initial_state.copy()]
-
-    num_steps = min(50, len(pulse_samples))
-    step_indices = np.linspace(0, len(pulse_samples)-1, num_steps, dtype=int)
-
-    cumulative_angle = 0
-    for i in step_indices:
-        partial_energy = np.sum(np.abs(pulse_samples[:i+1])**2)
-        cumulative_angle = target_angle * (partial_energy / pulse_energy)
-
-        cos_half = np.cos(cumulative_angle / 2)
-        sin_half = np.sin(cumulative_angle / 2)
-        rotation_matrix = np.array([
-            [cos_half, -1j * sin_half],
-            [-1j * sin_half, cos_half]
-        ], dtype=complex)
-
-        current_state = rotation_matrix @ initial_state
-        states.append(current_state.copy())
-
-    return states, effective_angle
-
-
-def state_to_bloch_vector(state):
-    """Convert quantum state to Bloch sphere coordinates (x, y, z)"""
-    alpha = state[0]
-    beta = state[1]
-    x = 2 * np.real(np.conj(alpha) * beta)
-    y = 2 * np.imag(np.conj(alpha) * beta)
-    z = np.abs(alpha)**2 - np.abs(beta)**2
-    return np.array([x, y, z])
-
-
-def plot_bloch_sphere_simple(states, title="Quantum State Evolution"):
-    """Create a simplified Bloch sphere visualization"""
-    fig = plt.figure(figsize=(10, 10))
-    ax = fig.add_subplot(111, projection='3d')
-
-    u = np.linspace(0, 2 * np.pi, 50)
-    v = np.linspace(0, np.pi, 50)
-    x_sphere = np.outer(np.cos(u), np.sin(v))
-    y_sphere = np.outer(np.sin(u), np.sin(v))
-    z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
-    ax.plot_surface(x_sphere, y_sphere, z_sphere, alpha=0.1, color='lightblue')
-
-    ax.quiver(0, 0, 0, 1.2, 0, 0, color='r', arrow_length_ratio=0.1, linewidth=2)
-    ax.quiver(0, 0, 0, 0, 1.2, 0, color='g', arrow_length_ratio=0.1, linewidth=2)
-    ax.quiver(0, 0, 0, 0, 0, 1.2, color='b', arrow_length_ratio=0.1, linewidth=2)
-    ax.text(1.3, 0, 0, 'X', fontsize=12, color='r')
-    ax.text(0, 1.3, 0, 'Y', fontsize=12, color='g')
-    ax.text(0, 0, 1.3, 'Z', fontsize=12, color='b')
-
-    bloch_vectors = [state_to_bloch_vector(s) for s in states]
-    bloch_vectors = np.array(bloch_vectors)
-
-    ax.plot(bloch_vectors[:, 0], bloch_vectors[:, 1], bloch_vectors[:, 2],
-            'o-', color='orange', linewidth=2, markersize=4, label='State Evolution')
-    ax.scatter(*bloch_vectors[0], color='green', s=100, marker='o', label='Initial |0⟩')
-    ax.scatter(*bloch_vectors[-1], color='red', s=100, marker='*', label='Final State')
-
-    ax.set_xlim([-1.2, 1.2])
-    ax.set_ylim([-1.2, 1.2])
-    ax.set_zlim([-1.2, 1.2])
-    ax.set_xlabel('X')
-    ax.set_ylabel('Y')
-    ax.set_zlabel('Z')
-    ax.set_title(title, fontsize=14, fontweight='bold')
-    ax.legend()
+    return start_disk_warmup(result_cache)
+
+
+@st.cache_resource
+def get_calibration_tables():
+    """Amplitude calibration tables. The app drives on resonance, so they are the area theorem: no build."""
+    return {name: resonant_table(name) for name in PULSE_NAMES}
+
 
+def calibrated_amplitude(name):
+    """Amplitude (fraction of full scale) for the target angle with the current shape parameters, or None."""
+    shape = {p: pulse_params[app_param] for p, app_param in SHAPE_PARAMS.get(name, {}).items()}
+    try:
+        amp = get_calibration_tables()[name].amplitude(duration, target_angle_deg, **shape)
+    except ValueError:
+        return None
+    return None if np.isnan(amp) else amp
+
+colors = ['#e65100', '#1565c0', '#2e7d32', '#c62828', '#6a1b9a', '#00838f', '#f9a825']
+name_to_color = {n: colors[i % len(colors)] for i, n in enumerate(PULSE_NAMES)}
+
+
+def render_time_domain(duration, visible, line_width, *samples):
+    fig = Figure(figsize=(12, 5))
+    ax1 = fig.add_subplot()
+    time_ns = np.arange(duration)
+    for name, s in zip(PULSE_NAMES, samples):
+        if name in visible:
+            ax1.plot(time_ns, s, label=name, color=name_to_color[name], linewidth=line_width, alpha=0.9)
+    ax1.set_xlabel('Time (ns)')
+    ax1.set_ylabel('Amplitude (normalized)')
+    ax1.set_title('Toggle pulses in sidebar to show/hide')
+    ax1.legend(loc='upper right', fontsize=9)
+    ax1.grid(True, alpha=0.3)
+    fig.subplots_adjust(**FIG_MARGINS)
+    return fig_to_png(fig)
+
+
+def spectrum_figure(visible, line_width, *spectra):
+    fig = Figure(figsize=(12, 5))
+    ax2 = fig.add_subplot()
+    for name, (freqs, psd) in zip(PULSE_NAMES, spectra):
+        if name in visible:
+            ax2.plot(freqs, psd, label=name, color=name_to_color[name], linewidth=line_width, alpha=0.9)
+    ax2.set_xlabel('Frequency (GHz)')
+    ax2.set_ylabel('Power Spectral Density (dB)')
+    ax2.legend(loc='upper right', fontsize=9)
+    ax2.grid(True, alpha=0.3)
+    fig.subplots_adjust(**FIG_MARGINS)
     return fig
 
 
-# Build all pulses (use custom Gaussian/DRAG when params differ from defaults)
-pulses = {
-    'Phi (Golden Ratio)': create_phi_pulse(duration, t_min, t_max),
-    'Gaussian': create_gaussian_custom(duration, sigma_factor),
-    'DRAG': create_drag_custom(duration, drag_beta),
-    'Square': create_square_pulse(duration),
-    'Sinc': create_sinc_pulse(duration),
-    'Raised Cosine': create_raised_cosine_pulse(duration),
-    'Gaussian Square': create_gaussian_square_pulse(duration),
-}
+def render_spectrum(fig, psd_ylim):
+    fig.axes[0].set_ylim(psd_ylim, 5)
+    return fig_to_png(fig)
+
+
+def bloch_stage(name):
+    def run(samples, angle_deg, resolution):
+        states, eff = simulate_trajectories({name: samples}, np.radians(angle_deg), resolution)[name]
+        return states_to_bloch_vectors(states), eff
+    return run
+
+
+def bloch_image_stage(name):
+    # Keyed by trajectory content, shared across sessions: unchanged trajectories are never redrawn.
+    def run(trajectory):
+        vectors = trajectory[0]
+        return result_cache.get_or_compute('fig_bloch', {'traj': trajectory_hash(vectors, name)},
+                                           lambda: render_bloch_png(vectors, name), BLOCH_CODE_FILES)
+    return run
+
+
+def build_app_graph(memo=None):
+    """Per-session dataflow: parameters -> pulses -> spectra/energies/leakage/Bloch -> figures."""
+    g = pulse_graph(PULSE_NAMES, memo)
+    g.add('png_time', render_time_domain, ['duration', 'visible', 'line_width'] + [f'pulse:{n}' for n in PULSE_NAMES])
+    g.add('fig_spectrum', spectrum_figure, ['visible', 'line_width'] + [f'spectrum:{n}' for n in PULSE_NAMES],
+          shared=False)  # mutable Figure: re-limited in place by png_spectrum
+    g.add('png_spectrum', render_spectrum, ['fig_spectrum', 'psd_ylim'])
+    for n in PULSE_NAMES:
+        g.add(f'bloch:{n}', bloch_stage(n), [f'pulse:{n}', 'target_angle_deg', 'bloch_resolution'])
+        g.add(f'bloch_png:{n}', bloch_image_stage(n), [f'bloch:{n}'])
+    sweep_params = ['t_min', 't_max', 'sigma_divisor', 'drag_beta', 'line_cutoff_ghz']
+    g.add('gate_sweep', lambda gate_range, *values: cached_sweep(result_cache, gate_range,
+                                                                 **dict(zip(sweep_params, values))),
+          ['gate_range'] + sweep_params)
+    return g
+
+
+# Slider defaults, warmed at server start together with their one-step neighbors.
+APP_DEFAULTS = dict(duration=160, t_min=-6.0, t_max=5.0, sigma_divisor=5, drag_beta=0.1, line_cutoff_ghz=None,
+                    visible=tuple(PULSE_NAMES), line_width=2.0, psd_ylim=-100, target_angle_deg=90,
+                    bloch_resolution=50, gate_range=IBM_RANGE_NS)
+WARM_TARGETS = (['png_time', 'png_spectrum'] + [f'{stage}:{n}' for stage in ('energy', 'leakage', 'bloch_png')
+                                                 for n in PULSE_NAMES])
+
+
+@st.cache_resource
+def get_stage_memo():
+    """Stage results shared by all sessions (and filled by the warm-up thread), LRU within a memory budget."""
+    return StageMemo()
+
+
+@st.cache_resource
+def get_warmer():
+    """Background thread precomputing the defaults and the neighbors of the last-seen configuration."""
+    warmer = Warmer(build_app_graph, get_stage_memo(), WARM_TARGETS, APP_DEFAULTS)
+    warmer.start()
+    return warmer
+
+
+# Only the stages whose inputs changed since the last rerun are recomputed.
+pulse_params = {'duration': duration, 't_min': t_min, 't_max': t_max,
+                'sigma_divisor': sigma_factor, 'drag_beta': drag_beta,
+                'line_cutoff_ghz': line_cutoff if line_filter_on else None}
 visibility = {
     'Phi (Golden Ratio)': show_phi,
     'Gaussian': show_gaussian,
@@ -323,56 +370,54 @@ visibility = {
     'Raised Cosine': show_raised_cosine,
     'Gaussian Square': show_gaussian_square,
 }
+app_params = dict(pulse_params, visible=tuple(n for n in PULSE_NAMES if visibility.get(n, True)),
+                  line_width=line_width, psd_ylim=psd_ylim, target_angle_deg=target_angle_deg,
+                  bloch_resolution=bloch_resolution, gate_range=tuple(gate_range))
+warmer = get_warmer()
+warmer.touch(app_params)
+get_disk_warmup()
+if 'dataflow' not in st.session_state:
+    st.session_state.dataflow = build_app_graph(get_stage_memo())
+graph = st.session_state.dataflow
+graph.set_params(**app_params)
+pulses = graph.get_many('pulse', PULSE_NAMES)
 visible_pulses = {k: v for k, v in pulses.items() if visibility.get(k, True)}
-energies = {name: np.sum(np.abs(p)**2) for name, p in pulses.items()}
-phi_energy = energies.get('Phi (Golden Ratio)', energies[list(energies.keys())[0]])
+energies = graph.get_many('energy', PULSE_NAMES)
 time_ns = np.arange(duration)
-colors = ['#e65100', '#1565c0', '#2e7d32', '#c62828', '#6a1b9a', '#00838f', '#f9a825']
-name_to_color = {n: colors[i % len(colors)] for i, n in enumerate(pulses.keys())}
+phi_energy = energies.get('Phi (Golden Ratio)', energies[list(energies.keys())[0]])
 
 # Time domain plot
 st.header("📈 Pulse Shapes (Time Domain)")
-fig1, ax1 = plt.subplots(figsize=(12, 5))
-for name, samples in visible_pulses.items():
-    ax1.plot(time_ns, samples, label=name, color=name_to_color[name], linewidth=line_width, alpha=0.9)
-ax1.set_xlabel('Time (ns)')
-ax1.set_ylabel('Amplitude (normalized)')
-ax1.set_title('Toggle pulses in sidebar to show/hide')
-ax1.legend(loc='upper right', fontsize=9)
-ax1.grid(True, alpha=0.3)
-st.pyplot(fig1, width="stretch")
-plt.close(fig1)
+st.image(graph.get('png_time'), width="stretch")
 
 # Frequency domain plot
 st.header("📡 Frequency Spectrum (Leakage)")
-fig2, ax2 = plt.subplots(figsize=(12, 5))
-for name, samples in visible_pulses.items():
-    freqs, psd = compute_fft(samples, dt_ns)
-    ax2.plot(freqs, psd, label=name, color=name_to_color[name], linewidth=line_width, alpha=0.9)
-ax2.set_xlabel('Frequency (GHz)')
-ax2.set_ylabel('Power Spectral Density (dB)')
-ax2.set_ylim(psd_ylim, 5)
-ax2.legend(loc='upper right', fontsize=9)
-ax2.grid(True, alpha=0.3)
-st.pyplot(fig2, width="stretch")
-plt.close(fig2)
+st.image(graph.get('png_spectrum'), width="stretch")
 
 # Bloch spheres - show all 7 pulse types (or single if unchecked)
 st.header("🌐 Bloch Sphere - Quantum State Evolution")
-st.markdown("Quantum state evolution under each pulse. Green = initial |0⟩, Red = final state.")
-target_angle = np.radians(target_angle_deg)
-pulses_for_bloch = pulses if bloch_show_all else {bloch_single_pulse: pulses[bloch_single_pulse]}
-n_bloch = len(pulses_for_bloch)
+st.markdown("Quantum state evolution under each pulse. Green = initial |0⟩, Red = final state. "
+            f"Calibrated amplitude: fraction of AWG full scale ({FULL_SCALE_RABI_MHZ:g} MHz Rabi) that rotates "
+            "|0⟩ by the target angle, on resonance (area theorem).")
+bloch_names = PULSE_NAMES if bloch_show_all else [bloch_single_pulse]
+n_bloch = len(bloch_names)
 cols = min(4, max(1, n_bloch))
-bloch_cols = st.columns(cols)
-for idx, (name, samples) in enumerate(pulses_for_bloch.items()):
-    states, eff_angle = simulate_quantum_evolution(samples, target_angle)
-    with bloch_cols[idx % cols]:
-        fig_bloch = plot_bloch_sphere_simple(states, f"{name}")
-        fig_bloch.set_size_inches(5, 5)
-        st.pyplot(fig_bloch, width="stretch")
-        plt.close(fig_bloch)
-        st.caption(f"{name}: {np.degrees(eff_angle):.1f} deg (target {target_angle_deg})")
+trajectories = graph.get_many('bloch', bloch_names)
+if bloch_combined and n_bloch > 1:
+    bloch_vectors = {name: v for name, (v, _) in trajectories.items()}
+    grid_key = {'traj': [trajectory_hash(v, name) for name, v in bloch_vectors.items()]}
+    st.image(result_cache.get_or_compute('fig_bloch_grid', grid_key, lambda: render_bloch_grid_png(bloch_vectors),
+                                         BLOCH_CODE_FILES), width="stretch")
+    st.caption(" | ".join(f"{name}: {np.degrees(eff):.1f} deg" for name, (_, eff) in trajectories.items())
+               + f" (target {target_angle_deg})")
+else:
+    bloch_cols = st.columns(cols)
+    for idx, (name, (_, eff_angle)) in enumerate(trajectories.items()):
+        with bloch_cols[idx % cols]:
+            st.image(graph.get(f'bloch_png:{name}'), width="stretch")
+            amp = calibrated_amplitude(name)
+            amp_note = f", calibrated amplitude {amp:.3f} FS" if amp is not None else ""
+            st.caption(f"{name}: {np.degrees(eff_angle):.1f} deg (target {target_angle_deg}){amp_note}")
 
 # Energy table
 st.header("📊 Energy Comparison (Phi vs All)")
@@ -384,23 +429,42 @@ st.dataframe(df_energy, width="stretch", hide_index=True)
 
 # Leakage metrics
 st.subheader("Leakage Metrics")
-leakage_metrics = {n: compute_leakage_metrics(s, dt_ns) for n, s in pulses.items()}
+leakage_metrics = graph.get_many('leakage', PULSE_NAMES)
 df_leakage = pd.DataFrame([
     {'Pulse': name, 'High-freq Leakage %': f'{lk:.4f}', 'Bandwidth (-40dB) GHz': f'{bw:.4f}'}
     for name, (lk, bw) in leakage_metrics.items()
 ])
 st.dataframe(df_leakage, width="stretch", hide_index=True)
 
+# Pareto fronts across each family's parameter space
+if show_pareto:
+    st.header("🎯 Pareto Fronts (Energy vs Leakage vs Duration)")
+    st.markdown("Non-dominated designs per family over duration and shape parameters. Hover points for details; marker size = duration.")
+    pareto_params = {'initial_points': 6, 'rounds': 5, 'n_random': 2, 'max_refine': 48}
+    with st.spinner("Searching parameter spaces..."):
+        pareto_rows = result_cache.get_or_compute('pareto', pareto_params,
+                                                  lambda: front_records(search_all(**pareto_params)),
+                                                  CODE_FILES + ['pareto_search.py'])
+    df_pareto = pd.DataFrame(pareto_rows)
+    df_pareto = df_pareto[df_pareto['family'].isin(list(visible_pulses))]
+    st.scatter_chart(df_pareto, x='energy', y='leakage_pct', color='family', size='duration', width="stretch")
+    with st.expander("Pareto front table"):
+        st.dataframe(df_pareto.dropna(axis=1, how='all'), width="stretch", hide_index=True)
+
 # IBM mode: Phi vs others (IBM context)
 if st.session_state.ibm_mode:
     st.header("Phi vs others (IBM context)")
     st.markdown("IBM single-qubit gates use Gaussian/DRAG at ~10–50 ns. Phi is compared above; lower energy and comparable leakage are favorable.")
     drag_energy = energies.get("DRAG", 1.0)
     duration_ns = duration  # 1 GS/s => 1 sample = 1 ns
-    ibm_range_ok = 10 <= duration_ns <= 50
+    range_label = f"{gate_range[0]}–{gate_range[1]} ns"
+    ibm_range_ok = gate_range[0] <= duration_ns <= gate_range[1]
+    # IBM alignment score (0-100): lower energy vs DRAG and lower leakage = higher; duration in range adds bonus
+    ibm_energy = np.array(list(energies.values()))
+    ibm_leakage = np.array([leakage_metrics.get(name, (0, 0))[0] for name in energies])
+    ibm_alignment = alignment_scores(ibm_energy, ibm_leakage, drag_energy, ibm_range_ok)
     ibm_rows = []
-    for name, e in energies.items():
-        lk, _ = leakage_metrics.get(name, (0, 0))
+    for (name, e), lk, alignment in zip(energies.items(), ibm_leakage, ibm_alignment):
         if name == "Phi (Golden Ratio)":
             energy_vs_drag = "—"
             phi_savings = "—"
@@ -408,35 +472,65 @@ if st.session_state.ibm_mode:
             pct_vs_drag = 100 * (e - drag_energy) / drag_energy if drag_energy else 0
             energy_vs_drag = f"{pct_vs_drag:+.1f}% vs DRAG"
             phi_savings = f"{100*(1 - phi_energy/e):.1f}%" if e > 0 else "—"
-        in_range = "Yes" if ibm_range_ok else "No"
-        # Simple IBM alignment score (0-100): lower energy vs DRAG and lower leakage = higher; duration in range adds bonus
-        if drag_energy and drag_energy > 0:
-            energy_penalty = min(50, max(0, 50 * (e / drag_energy - 1)))  # 0 if e <= drag, else up to 50
-            leakage_penalty = min(40, lk * 10)
-            alignment = max(0, min(100, 100 - energy_penalty - leakage_penalty + (10 if ibm_range_ok else 0)))
-        else:
-            alignment = 50
         ibm_rows.append({
             "Pulse": name,
             "Energy": f"{e:.2f}",
             "Energy vs DRAG": energy_vs_drag,
             "Phi savings vs this": phi_savings,
             "High-freq leakage %": f"{lk:.4f}",
-            "Duration in 10–50 ns?": in_range,
+            f"Duration in {range_label}?": "Yes" if ibm_range_ok else "No",
             "IBM alignment (0–100)": f"{alignment:.0f}",
         })
     df_ibm = pd.DataFrame(ibm_rows)
     st.dataframe(df_ibm, width="stretch", hide_index=True)
-    st.caption(f"Current duration: {duration_ns} ns. {'Within IBM single-qubit range (10–50 ns).' if ibm_range_ok else 'Outside 10–50 ns; adjust Duration (samples) in sidebar for IBM-like comparison.'}")
-    st.download_button("Download IBM table (CSV)", df_ibm.to_csv(index=False), file_name=f"ibm_phi_vs_others_{duration_ns}ns.csv", mime="text/csv", key="dl_ibm_csv")
+    st.caption(f"Current duration: {duration_ns} ns. {f'Within the {range_label} gate-length range.' if ibm_range_ok else f'Outside {range_label}; the curves below cover the whole range.'}")
+    st.download_button(f"Download IBM table ({download_format.upper()})", lambda: table_bytes(df_ibm, download_format),
+                       file_name=file_name(f"ibm_phi_vs_others_{duration_ns}ns", download_format), mime=download_mime,
+                       key="dl_ibm_csv")
+
+    st.subheader(f"Across {range_label}")
+    sweep_records = graph.get('gate_sweep')
+    df_sweep = pd.DataFrame(sweep_records)
+    df_sweep = df_sweep[df_sweep['family'].isin(list(visible_pulses))]
+    if df_sweep.empty:
+        st.caption("No pulse family is visible; enable one in the sidebar to see its curves and best duration.")
+    else:
+        curve_tabs = st.tabs(["IBM alignment", "Energy", "High-freq leakage %"])
+        for tab, metric in zip(curve_tabs, ['alignment', 'energy', 'leakage_pct']):
+            with tab:
+                st.line_chart(df_sweep, x='duration', y=metric, color='family', width="stretch")
+        df_best = pd.DataFrame([r for r in best_durations(sweep_records) if r['family'] in visible_pulses])
+        st.dataframe(df_best.drop(columns='in_range').rename(columns={'family': 'Pulse',
+                                                                      'duration': 'Best duration (ns)'}),
+                     width="stretch", hide_index=True)
+        st.caption("Best duration: highest alignment, ties broken by lower energy, then shorter duration.")
+    st.download_button(f"Download gate-length sweep ({download_format.upper()})",
+                       lambda: table_bytes(pd.DataFrame(sweep_records), download_format),
+                       file_name=file_name(f"gate_length_sweep_{gate_range[0]}_{gate_range[1]}ns", download_format),
+                       mime=download_mime, key="dl_gate_sweep")
 
 # CSV Download
 st.subheader("Download Data")
-data_dict = {'Time_ns': time_ns}
-for name, p in pulses.items():
-    data_dict[name.replace(' ', '_')] = p
-df_csv = pd.DataFrame(data_dict)
-st.download_button("Download CSV (all pulses)", df_csv.to_csv(index=False), file_name=f"all_pulses_{duration}.csv", mime="text/csv", key="dl_csv")
+# Serialized only when clicked (the callable runs on download), not on every rerun.
+st.download_button(f"Download {download_format.upper()} (all pulses)", lambda: table_bytes(pulse_table(pulses), download_format),
+                   file_name=file_name(f"all_pulses_{duration}", download_format), mime=download_mime, key="dl_csv")
+st.download_button(f"Download duration sweep 10–500 ({download_format.upper()} tables, ZIP)",
+                   lambda: sweep_archive_bytes(fmt=download_format, **{k: v for k, v in pulse_params.items() if k != 'duration'}),
+                   file_name=f"pulse_sweep_{download_format}.zip", mime="application/zip", key="dl_sweep")
 
 st.markdown("---")
 st.markdown("Phi pulse: A(t) = φ^(-t(t+1)/2). Toggle pulse visibility in sidebar to compare.")
+
+with st.sidebar.expander("Cache & warm-up", expanded=False):
+    warm_stats = warmer.stats()
+    st.caption(f"Shared stage cache: hit rate {100 * warm_stats['hit_rate']:.0f}% "
+               f"({warm_stats['hits']} hits / {warm_stats['misses']} misses), {warm_stats['entries']} entries, "
+               f"{warm_stats['bytes'] / 2**20:.1f} of {warm_stats['max_bytes'] / 2**20:.0f} MB, "
+               f"{warm_stats['evictions']} evicted. This rerun: {len(graph.reused)} stages reused, "
+               f"{len(graph.executed)} computed.")
+    st.caption(f"Warm-up: {warm_stats['warmed_configs']} configurations precomputed in "
+               f"{warm_stats['warm_seconds']:.1f} s, {warm_stats['pending_configs']} queued.")
+    disk = result_cache.stats()
+    st.caption(f"Disk cache: {disk['entries']} entries, {disk['bytes'] / 2**20:.1f} MB, "
+               f"hit rate {100 * disk['hit_rate']:.0f}%.")
+warmer.touch()
@@ -0,0 +1,143 @@
+"""
+Bloch-sphere rendering with a reusable figure template.
+The sphere surface, axes arrows, labels and legend are rasterized once per layout; each render restores
+that background and draws only the trajectory artists and titles (blitting). Renders are keyed by a hash
+of the trajectory so unchanged trajectories reuse their image. Several spheres render as subplots of one figure, or in worker processes.
+"""
+import hashlib
+import threading
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.image import imsave
+from matplotlib.lines import Line2D
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers the 3d projection)
+
+SPHERE_RES = 50
+PANEL_INCHES = 5
+DPI = 150
+MARKER_POINTS = 50
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def trajectory_hash(vectors, title=''):
+    """Content hash of a trajectory (and its title) for image caching."""
+    v = np.ascontiguousarray(vectors, dtype=np.float64)
+    h = hashlib.sha256(v.tobytes())
+    h.update(str(v.shape).encode())
+    h.update(title.encode())
+    return h.hexdigest()
+
+
+class BlochTemplate:
+    """
+    A figure of n Bloch spheres. The static scene (surface, arrows, labels, legend) is rasterized once;
+    each render restores that background and draws only the trajectory artists and titles on top.
+    """
+
+    def __init__(self, n=1, cols=None, panel_inches=PANEL_INCHES):
+        self.n = n
+        self.cols = cols or min(4, n)
+        rows = -(-n // self.cols)
+        self.fig = Figure(figsize=(panel_inches * self.cols, panel_inches * rows), dpi=DPI)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.lock = threading.Lock()
+        u = np.linspace(0, 2 * np.pi, SPHERE_RES)
+        v = np.linspace(0, np.pi, SPHERE_RES)
+        xs, ys, zs = np.outer(np.cos(u), np.sin(v)), np.outer(np.sin(u), np.sin(v)), np.outer(np.ones(SPHERE_RES), np.cos(v))
+        self.panels = []
+        for i in range(n):
+            ax = self.fig.add_subplot(rows, self.cols, i + 1, projection='3d')
+            ax.plot_surface(xs, ys, zs, alpha=0.1, color='lightblue')
+            for vec, color, label in (((1.2, 0, 0), 'r', 'X'), ((0, 1.2, 0), 'g', 'Y'), ((0, 0, 1.2), 'b', 'Z')):
+                ax.quiver(0, 0, 0, *vec, color=color, arrow_length_ratio=0.1, linewidth=2)
+                ax.text(*(np.array(vec) * 1.3 / 1.2), label, fontsize=12, color=color)
+            ax.set_xlim([-1.2, 1.2])
+            ax.set_ylim([-1.2, 1.2])
+            ax.set_zlim([-1.2, 1.2])
+            ax.set_xlabel('X')
+            ax.set_ylabel('Y')
+            ax.set_zlabel('Z')
+            path, = ax.plot([], [], [], 'o-', color='orange', linewidth=2, markersize=4, animated=True)
+            start, = ax.plot([], [], [], 'o', color='green', markersize=10, animated=True)
+            end, = ax.plot([], [], [], '*', color='red', markersize=14, animated=True)
+            ax.title.set_animated(True)
+            ax.legend(handles=[
+                Line2D([], [], marker='o', color='orange', label='State Evolution'),
+                Line2D([], [], marker='o', color='green', linestyle='', label='Initial |0⟩'),
+                Line2D([], [], marker='*', color='red', linestyle='', markersize=10, label='Final State'),
+            ], loc='lower left', fontsize=8)
+            self.panels.append((ax, path, start, end))
+        self.fig.subplots_adjust(left=0, right=1, bottom=0, top=0.95, wspace=0, hspace=0.05)
+        self.canvas.draw()  # animated artists are skipped: this is the static scene
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def render(self, trajectories, fontsize=14):
+        """PNG bytes for a list of (bloch_vectors (k, 3), title); unused panels stay empty."""
+        with self.lock:
+            self.canvas.restore_region(self.background)
+            for (ax, path, start, end), (vectors, title) in zip(self.panels, trajectories):
+                vectors = np.asarray(vectors)
+                path.set_data_3d(vectors[:, 0], vectors[:, 1], vectors[:, 2])
+                path.set_markevery(max(1, len(vectors) // MARKER_POINTS))
+                start.set_data_3d(vectors[:1, 0], vectors[:1, 1], vectors[:1, 2])
+                end.set_data_3d(vectors[-1:, 0], vectors[-1:, 1], vectors[-1:, 2])
+                ax.set_title(title, fontsize=fontsize, fontweight='bold')
+                for artist in (path, start, end, ax.title):
+                    ax.draw_artist(artist)
+            buf = BytesIO()
+            imsave(buf, np.asarray(self.canvas.buffer_rgba()), format='png')
+            return buf.getvalue()
+
+
+def get_template(n=1, cols=None):
+    """Shared template for a layout (built on first use)."""
+    key = (n, cols or min(4, n))
+    with _templates_lock:
+        if key not in _templates:
+            _templates[key] = BlochTemplate(n, key[1])
+        return _templates[key]
+
+
+def render_bloch_png(vectors, title):
+    """One sphere, drawn on the shared single-panel template."""
+    return get_template(1).render([(vectors, title)])
+
+
+def render_bloch_grid_png(trajectories, cols=None):
+    """All spheres as subplots of one figure. trajectories: {title: bloch_vectors}."""
+    items = list(trajectories.items())
+    return get_template(len(items), cols).render([(v, t) for t, v in items], fontsize=12)
+
+
+def _render_job(args):
+    return render_bloch_png(*args)
+
+
+_pool = None
+
+
+def render_bloch_pngs(trajectories, workers=None, cache=None):
+    """
+    One PNG per trajectory {title: bloch_vectors}, reusing `cache` (a dict-like keyed by
+    trajectory_hash) for unchanged trajectories. With workers > 1, misses render in worker processes.
+    Returns {title: png_bytes}.
+    """
+    global _pool
+    cache = {} if cache is None else cache
+    keys = {t: trajectory_hash(v, t) for t, v in trajectories.items()}
+    missing = [t for t in trajectories if keys[t] not in cache]
+    if workers and workers > 1 and len(missing) > 1:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        pngs = _pool.map(_render_job, [(trajectories[t], t) for t in missing])
+    else:
+        pngs = (render_bloch_png(trajectories[t], t) for t in missing)
+    for t, png in zip(missing, pngs):
+        cache[keys[t]] = png
+    return {t: cache[keys[t]] for t in trajectories}
@@ -0,0 +1,65 @@
+"""
+Vectorized Bloch-sphere trajectories for pulse envelopes.
+Rotation angle at sample i is target_angle * cumsum(|A|^2)[i] / sum(|A|^2) (X rotation from |0>),
+computed with one prefix sum and one batched state construction for all pulses at once.
+"""
+import numpy as np
+
+
+def step_indices(n_samples, resolution=None):
+    """Sample indices to report: every sample if resolution is None/0 or >= n_samples."""
+    if not resolution or resolution >= n_samples:
+        return np.arange(n_samples)
+    return np.linspace(0, n_samples - 1, resolution, dtype=int)
+
+
+def cumulative_angles(pulse_samples, target_angle=np.pi/2, resolution=None):
+    """
+    Rotation angle after each reported sample. pulse_samples: (n,) or (batch, n).
+    Returns (angles, effective_angle) with angles shaped (..., steps).
+    """
+    p = np.asarray(pulse_samples)
+    power = np.abs(p)**2
+    cum = np.cumsum(power, axis=-1)
+    total = cum[..., -1:]
+    n = p.shape[-1]
+    frac = np.divide(cum, total, out=np.zeros_like(cum), where=total > 0)
+    angles = target_angle * frac[..., step_indices(n, resolution)]
+    effective_angle = target_angle * (total[..., 0] / n) / 0.5
+    return angles, effective_angle
+
+
+def rotation_states(angles):
+    """States RX(angle)|0> for every angle, with |0> prepended. Returns (..., steps+1, 2) complex."""
+    angles = np.asarray(angles, dtype=float)
+    full = np.concatenate([np.zeros(angles.shape[:-1] + (1,)), angles], axis=-1)
+    states = np.empty(full.shape + (2,), dtype=complex)
+    states[..., 0] = np.cos(full / 2)
+    states[..., 1] = -1j * np.sin(full / 2)
+    return states
+
+
+def states_to_bloch_vectors(states):
+    """Bloch (x, y, z) for an array of states shaped (..., 2). Returns (..., 3)."""
+    states = np.asarray(states)
+    alpha, beta = states[..., 0], states[..., 1]
+    ab = np.conj(alpha) * beta
+    return np.stack([2 * ab.real, 2 * ab.imag, np.abs(alpha)**2 - np.abs(beta)**2], axis=-1)
+
+
+def simulate_trajectories(pulses, target_angle=np.pi/2, resolution=None):
+    """
+    Batched trajectories for a dict {name: samples}. Pulses of equal length are stacked
+    and processed together. Returns {name: (states, effective_angle)}.
+    """
+    by_len = {}
+    for name, samples in pulses.items():
+        by_len.setdefault(len(samples), []).append(name)
+    out = {}
+    for names in by_len.values():
+        batch = np.stack([pulses[n] for n in names])
+        angles, eff = cumulative_angles(batch, target_angle, resolution)
+        states = rotation_states(angles)
+        for i, name in enumerate(names):
+            out[name] = (states[i], float(eff[i]))
+    return {name: out[name] for name in pulses}
@@ -0,0 +1,176 @@
+"""
+Build the website's static dataset: pulses, spectra and metrics over a parameter grid.
+One little-endian float32 chunk per (family, duration) plus website/data/manifest.json,
+so the page fetches only the chunk a visitor looks at (see website/pulse_data.js).
+Chunks whose inputs and code are unchanged are reused; dirty chunks are built in parallel.
+Run: python build_website_data.py [--out website/data] [--workers N] [--force]
+"""
+import os
+import json
+import argparse
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.fft import fft, fftshift
+
+from pulse_comparison import (
+    PULSE_FAMILIES,
+    FAMILY_KEYS,
+    SAMPLE_RATE_GS,
+    create_pulse,
+    compute_leakage_metrics_batch,
+    dt_sec,
+)
+from result_cache import code_version
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(SCRIPT_DIR, 'website', 'data')
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+CODE_FILES = ['pulse_comparison.py', 'build_website_data.py']
+
+# Same duration range and step as the app's slider.
+DURATIONS = list(range(10, 501, 10))
+# Shape-parameter values per family; families not listed use their defaults only.
+PARAM_GRID = {
+    'Phi (Golden Ratio)': {'t_min': [float(v) for v in range(-10, -1)], 't_max': [float(v) for v in range(2, 11)]},
+    'Gaussian': {'sigma_divisor': list(range(2, 16))},
+    'DRAG': {'beta': [round(0.05 * i, 2) for i in range(11)]},
+    'Gaussian Square': {'flat_fraction': [round(0.1 * i, 1) for i in range(1, 10)]},
+}
+METRIC_COLUMNS = ['energy', 'leakage_pct', 'bandwidth_ghz']
+
+
+def family_key(name):
+    return {v: k for k, v in FAMILY_KEYS.items()}[name]
+
+
+def param_combinations(family, grid=None):
+    """(param_names, list of value tuples) for one family's grid."""
+    axes = (grid or PARAM_GRID).get(family, {})
+    names = sorted(axes)
+    return names, list(itertools.product(*(axes[n] for n in names)))
+
+
+def chunk_hash(family, duration, names, combos):
+    payload = json.dumps([FORMAT_VERSION, family, duration, names, combos, code_version(CODE_FILES)])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def compute_chunk(family, duration, names, combos):
+    """Stacked samples, PSD (dB, fftshifted) and metrics for every parameter combination."""
+    samples = np.stack([create_pulse(family, duration, **dict(zip(names, c))) for c in combos])
+    psd = 20 * np.log10(np.abs(fftshift(fft(samples, axis=-1), axes=-1)) + 1e-15)
+    psd -= np.max(psd, axis=-1, keepdims=True)
+    leakage, bandwidth = compute_leakage_metrics_batch(samples, dt_sec)
+    metrics = np.column_stack([np.sum(samples**2, axis=-1), leakage, bandwidth])
+    return {'samples': samples, 'psd': psd, 'metrics': metrics}
+
+
+def write_chunk(out_dir, family, duration, names, combos, digest):
+    """Compute one chunk, write it as concatenated float32 blocks and return its manifest entry."""
+    arrays = compute_chunk(family, duration, names, combos)
+    fname = f"{family_key(family)}_{duration}.bin"
+    blocks, offset = {}, 0
+    tmp = os.path.join(out_dir, fname + '.tmp')
+    with open(tmp, 'wb') as f:
+        for block, arr in arrays.items():
+            data = np.ascontiguousarray(arr, dtype='<f4')
+            f.write(data.tobytes())
+            blocks[block] = {'offset': offset, 'shape': list(data.shape)}
+            offset += data.nbytes
+    os.replace(tmp, os.path.join(out_dir, fname))
+    return {'file': fname, 'hash': digest, 'family': family, 'duration': duration,
+            'params': [list(c) for c in combos], 'bytes': offset, 'blocks': blocks}
+
+
+def _write_chunk_job(args):
+    return write_chunk(*args)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+        return manifest if manifest.get('version') == FORMAT_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def build_dataset(out_dir=DEFAULT_OUT, durations=None, grid=None, workers=None, force=False):
+    """
+    Build or update the dataset in out_dir. Returns (manifest, number of chunks rebuilt).
+    workers=1 builds in-process; otherwise dirty chunks go to a process pool.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    old = (load_manifest(out_dir) or {}).get('chunks', {}) if not force else {}
+    families, chunks, jobs = {}, {}, []
+    for family in PULSE_FAMILIES:
+        names, combos = param_combinations(family, grid)
+        key = family_key(family)
+        families[key] = {'name': family, 'param_names': names}
+        for duration in durations or DURATIONS:
+            cid = f"{key}/{duration}"
+            digest = chunk_hash(family, duration, names, combos)
+            prev = old.get(cid)
+            if (prev and prev.get('hash') == digest
+                    and os.path.isfile(os.path.join(out_dir, prev['file']))
+                    and os.path.getsize(os.path.join(out_dir, prev['file'])) == prev['bytes']):
+                chunks[cid] = prev
+            else:
+                jobs.append((cid, (out_dir, family, duration, names, combos, digest)))
+
+    if workers == 1 or len(jobs) <= 1:
+        for cid, args in jobs:
+            chunks[cid] = write_chunk(*args)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for (cid, _), entry in zip(jobs, ex.map(_write_chunk_job, [a for _, a in jobs], chunksize=4)):
+                chunks[cid] = entry
+
+    live = {c['file'] for c in chunks.values()}
+    for prev in old.values():
+        path = os.path.join(out_dir, prev['file'])
+        if prev['file'] not in live and os.path.isfile(path):
+            os.remove(path)
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'dtype': 'float32',
+        'byte_order': 'little',
+        'sample_rate_gs': SAMPLE_RATE_GS,
+        'metric_columns': METRIC_COLUMNS,
+        'families': families,
+        'durations': sorted({c['duration'] for c in chunks.values()}),
+        'chunks': dict(sorted(chunks.items())),
+    }
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    return manifest, len(jobs)
+
+
+def load_chunk(out_dir, entry):
+    """Read a chunk back as {block: float32 array} (memory-mapped)."""
+    raw = np.memmap(os.path.join(out_dir, entry['file']), dtype='<f4', mode='r')
+    out = {}
+    for block, meta in entry['blocks'].items():
+        start = meta['offset'] // 4
+        out[block] = raw[start:start + int(np.prod(meta['shape']))].reshape(meta['shape'])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Build the website pulse dataset')
+    ap.add_argument('--out', default=DEFAULT_OUT)
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--force', action='store_true', help='Rebuild every chunk')
+    args = ap.parse_args()
+    manifest, rebuilt = build_dataset(args.out, workers=args.workers, force=args.force)
+    total = sum(c['bytes'] for c in manifest['chunks'].values())
+    print(f"{len(manifest['chunks'])} chunks ({rebuilt} rebuilt), {total / 1e6:.1f} MB in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+On-demand table and sweep exports for the app's download buttons.
+Tables serialize to CSV, NPZ, or (with pyarrow) Parquet and Arrow IPC only when a download is requested.
+Parameter sweeps are written as ZIP archives one entry at a time, either into a file object or as a
+stream of byte chunks, so the CLI export never holds a full sweep in memory (the app's download button
+needs the archive as bytes and joins the chunks).
+Run: python data_export.py [--format npz] [--out pulse_sweep.zip]
+"""
+import io
+import argparse
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from pulse_comparison import build_pulses
+from pulse_distortion import awg_lowpass, distort_pulses
+from result_cache import DEFAULT_PARAMS
+
+SWEEP_DURATIONS = range(10, 501, 10)
+# name -> (file extension, MIME type)
+FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+    'npz': ('npz', 'application/octet-stream'),
+}
+ARROW_FORMATS = ('parquet', 'arrow')
+
+_UNSET = object()
+_pyarrow = _UNSET
+
+
+def get_pyarrow():
+    """Import pyarrow (with parquet) once and reuse it. Returns None if unavailable."""
+    global _pyarrow
+    if _pyarrow is _UNSET:
+        try:
+            import pyarrow
+            import pyarrow.parquet  # noqa: F401
+            _pyarrow = pyarrow
+        except ImportError:
+            _pyarrow = None
+    return _pyarrow
+
+
+def available_formats():
+    return [f for f in FORMATS if f not in ARROW_FORMATS or get_pyarrow() is not None]
+
+
+def file_name(stem, fmt):
+    return f"{stem}.{FORMATS[fmt][0]}"
+
+
+def table_bytes(table, fmt='csv'):
+    """Serialize a DataFrame or {column: 1-D array} in one of FORMATS."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {list(FORMATS)}")
+    df = table if isinstance(table, pd.DataFrame) else pd.DataFrame(table)
+    if fmt == 'csv':
+        return df.to_csv(index=False).encode()
+    buf = io.BytesIO()
+    if fmt == 'npz':
+        # Text columns become fixed-width unicode so the file loads without allow_pickle.
+        np.savez(buf, **{str(c): df[c].to_numpy() if pd.api.types.is_numeric_dtype(df[c]) else df[c].to_numpy(dtype=str)
+                         for c in df.columns})
+        return buf.getvalue()
+    pa = get_pyarrow()
+    if pa is None:
+        raise ImportError(f"{fmt} export needs pyarrow (pip install pyarrow)")
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == 'parquet':
+        pa.parquet.write_table(arrow_table, buf)
+    else:
+        with pa.ipc.new_file(buf, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    return buf.getvalue()
+
+
+def pulse_table(pulses):
+    """{Time_ns, <pulse name with underscores>: samples} for equal-length pulses."""
+    n = len(next(iter(pulses.values())))
+    table = {'Time_ns': np.arange(n)}
+    table.update({name.replace(' ', '_'): samples for name, samples in pulses.items()})
+    return table
+
+
+def _sweep_entries(fileobj, durations, fmt, params):
+    """Write the sweep ZIP into fileobj, yielding after each entry; the central directory is written last."""
+    params = dict(DEFAULT_PARAMS, **params)
+    cutoff = params.pop('line_cutoff_ghz', None)
+    line = awg_lowpass(cutoff) if cutoff else None
+    # Text compresses well; the binary formats are already compact.
+    compression = zipfile.ZIP_DEFLATED if fmt == 'csv' else zipfile.ZIP_STORED
+    with zipfile.ZipFile(fileobj, 'w', compression=compression) as zf:
+        for d in durations:
+            pulses = build_pulses(**dict(params, duration=int(d)))
+            if line is not None:
+                pulses = distort_pulses(pulses, line)
+            zf.writestr(file_name(f'pulses_{int(d):04d}', fmt), table_bytes(pulse_table(pulses), fmt))
+            yield
+
+
+def write_sweep_archive(fileobj, durations=SWEEP_DURATIONS, fmt='npz', **params):
+    """
+    ZIP of one pulse table per duration (same generators and line filter as the app), written entry by
+    entry into a writable file object (need not be seekable). Returns the number of entries.
+    """
+    return sum(1 for _ in _sweep_entries(fileobj, durations, fmt, params))
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target whose contents are drained by a generator."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        out, self.chunks = b''.join(self.chunks), []
+        return out
+
+
+def iter_sweep_archive(durations=SWEEP_DURATIONS, fmt='npz', **params):
+    """The same archive as write_sweep_archive, yielded as byte chunks (one per entry, then the directory)."""
+    sink = _ChunkSink()
+    for _ in _sweep_entries(sink, durations, fmt, params):
+        yield sink.drain()
+    yield sink.drain()
+
+
+def sweep_archive_bytes(durations=SWEEP_DURATIONS, fmt='npz', **params):
+    """The whole archive in memory, for download buttons that take bytes."""
+    return b''.join(iter_sweep_archive(durations, fmt, **params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a duration sweep of all pulses as a ZIP archive.")
+    parser.add_argument('--format', choices=list(FORMATS), default='npz')
+    parser.add_argument('--out', default='pulse_sweep.zip')
+    args = parser.parse_args()
+    with open(args.out, 'wb') as f:
+        n = write_sweep_archive(f, fmt=args.format)
+    print(f"Wrote {n} tables to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
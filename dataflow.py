@@ -0,0 +1,155 @@
+"""
+Small dataflow graph for incremental recomputation across app reruns.
+Parameters and nodes carry version counters; a node re-runs only when an input's version changed since
+it last ran, so each rerun executes just the dirty subgraph. A node whose new value equals the old one
+keeps its version, which stops the invalidation there. Values stay in memory (one graph per session).
+Graphs can share a memo (e.g. warmup.StageMemo): a shared node is then looked up by its name and the
+values of the parameters it transitively depends on, before any of its inputs are resolved, so a memo hit
+skips the whole upstream subgraph.
+"""
+import numpy as np
+
+from pulse_comparison import PULSE_NAMES, create_pulse, get_spectral_energy, compute_leakage_metrics, dt_sec
+from pulse_distortion import awg_lowpass
+
+# App parameter feeding each family's shape parameter (as in build_pulses); other families only use duration.
+SHAPE_PARAMS = {
+    'Phi (Golden Ratio)': {'t_min': 't_min', 't_max': 't_max'},
+    'Gaussian': {'sigma_divisor': 'sigma_divisor'},
+    'DRAG': {'beta': 'drag_beta'},
+}
+
+
+def _same(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and a.shape == b.shape and np.array_equal(a, b)
+    if isinstance(a, (tuple, list)) and isinstance(b, (tuple, list)):
+        return type(a) is type(b) and len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def _freeze(value):
+    """Hashable memo-key form of a parameter value (floats rounded so slider arithmetic matches)."""
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), 9)
+    if isinstance(value, (tuple, list)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Dataflow:
+    """Named parameters plus nodes name -> (func, deps); get(name) recomputes only what is stale."""
+
+    def __init__(self, memo=None):
+        self._nodes = {}
+        self._values = {}
+        self._versions = {}
+        self._stamps = {}
+        self._keys = {}  # shared node -> memo key of its current value
+        self._shared = set()
+        self._roots = {}
+        self.memo = memo  # object with get_or_compute(key, compute), shared between graphs
+        self.executed = []  # nodes run since the last set_params()
+        self.reused = []  # stale nodes taken from the memo since the last set_params()
+
+    def add(self, name, func, deps=(), shared=True):
+        """shared=False keeps a node out of the memo (e.g. mutable values such as figures)."""
+        self._nodes[name] = (func, tuple(deps))
+        self._stamps.pop(name, None)
+        self._keys.pop(name, None)
+        self._roots.clear()
+        if shared:
+            self._shared.add(name)
+        else:
+            self._shared.discard(name)
+        return self
+
+    def roots(self, name):
+        """Parameters a node transitively depends on, sorted."""
+        if name not in self._nodes:
+            return (name,)
+        if name not in self._roots:
+            self._roots[name] = tuple(sorted({p for d in self._nodes[name][1] for p in self.roots(d)}))
+        return self._roots[name]
+
+    def set_params(self, **params):
+        """Update parameters; only changed values invalidate their dependents."""
+        self.executed = []
+        self.reused = []
+        for name, value in params.items():
+            if name in self._nodes:
+                raise ValueError(f"{name!r} is a node, not a parameter")
+            if name in self._values and _same(self._values[name], value):
+                continue
+            self._values[name] = value
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def get(self, name):
+        if name not in self._nodes:
+            if name not in self._values:
+                raise KeyError(f"Unknown parameter or node {name!r}")
+            return self._values[name]
+        func, deps = self._nodes[name]
+        if self.memo is not None and name in self._shared:
+            return self._get_shared(name, func, deps)
+        args = [self.get(d) for d in deps]
+        stamp = tuple(self._versions[d] for d in deps)
+        if self._stamps.get(name) != stamp:
+            self._store(name, func(*args))
+            self.executed.append(name)
+            self._stamps[name] = stamp
+        return self._values[name]
+
+    def _get_shared(self, name, func, deps):
+        """Memoized node: fresh while its root parameters are unchanged; inputs resolved only on a memo miss."""
+        key = (name,) + tuple(_freeze(self.get(p)) for p in self.roots(name))
+        if self._keys.get(name) != key:
+            ran = []
+
+            def compute():
+                ran.append(name)
+                return func(*[self.get(d) for d in deps])
+            self._store(name, self.memo.get_or_compute(key, compute))
+            (self.executed if ran else self.reused).append(name)
+            self._keys[name] = key
+        return self._values[name]
+
+    def _store(self, name, value):
+        """Set a node's value; its version changes only if the value did (early cutoff)."""
+        if name not in self._values or not _same(self._values[name], value):
+            self._values[name] = value
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def get_many(self, prefix, names):
+        """{name: get(f'{prefix}:{name}')} for a list of names."""
+        return {n: self.get(f'{prefix}:{n}') for n in names}
+
+
+def _raw_pulse(name, params):
+    def build(duration, *values):
+        return create_pulse(name, duration, **dict(zip(params, values)))
+    return build
+
+
+def _distorted(samples, line):
+    return samples if line is None else line.apply(samples)
+
+
+def pulse_graph(names=PULSE_NAMES, memo=None):
+    """
+    Per-pulse stages of the app: pulse:<name>, spectrum:<name>, energy:<name>, leakage:<name>.
+    Parameters: duration, t_min, t_max, sigma_divisor, drag_beta, line_cutoff_ghz (None = no line filter).
+    """
+    g = Dataflow(memo)
+    g.add('line', lambda cutoff: awg_lowpass(cutoff) if cutoff else None, ['line_cutoff_ghz'])
+    for name in names:
+        shape = SHAPE_PARAMS.get(name, {})
+        g.add(f'raw:{name}', _raw_pulse(name, list(shape)), ['duration'] + list(shape.values()))
+        g.add(f'pulse:{name}', _distorted, [f'raw:{name}', 'line'])
+        g.add(f'spectrum:{name}', lambda s: get_spectral_energy(s, dt_sec), [f'pulse:{name}'])
+        g.add(f'energy:{name}', lambda s: float(np.sum(np.abs(s)**2)), [f'pulse:{name}'])
+        g.add(f'leakage:{name}', lambda s: compute_leakage_metrics(s, dt_sec), [f'pulse:{name}'])
+    return g
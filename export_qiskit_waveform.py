@@ -2,8 +2,8 @@
 Export Phi and other pulses as Qiskit Waveform (.npz) for use with real quantum hardware.
 Run: python export_qiskit_waveform.py
 Output: phi_pulses.npz (numpy arrays) and optional Qiskit Waveform if qiskit available.
+Large libraries: export_waveform_library() writes one indexed waveform_library.npz.
 """
-import os
 import numpy as np
 
 from pulse_comparison import (
@@ -17,6 +17,110 @@ from pulse_comparison import (
     SAMPLE_RATE_GS,
 )
 
+LIBRARY_FILE = 'waveform_library.npz'
+AMPLITUDE_EPS = 1e-7  # same tolerance Qiskit uses when limiting |amplitude| <= 1
+
+_UNSET = object()
+_qiskit_pulse = _UNSET
+
+
+def get_qiskit_pulse():
+    """Import qiskit.pulse once and reuse it. Returns None if unavailable."""
+    global _qiskit_pulse
+    if _qiskit_pulse is _UNSET:
+        try:
+            import qiskit.pulse as qp
+            _qiskit_pulse = qp
+        except ImportError:
+            _qiskit_pulse = None
+    return _qiskit_pulse
+
+
+def _iter_batch(batch):
+    """Yield (name, samples) from a dict or a (names, 2-D array) pair."""
+    if isinstance(batch, dict):
+        yield from batch.items()
+    else:
+        names, arr = batch
+        arr = np.atleast_2d(arr)
+        if len(names) != arr.shape[0]:
+            raise ValueError(f"Batch has {len(names)} names but {arr.shape[0]} waveforms")
+        yield from zip(names, arr)
+
+
+def export_waveform_library(batches, path=LIBRARY_FILE, dt=None, schedules=False, channel=0):
+    """
+    Write batches of waveforms to one indexed .npz library.
+    batches: iterable of dicts {name: samples} or (names, 2-D array) pairs.
+    The library holds a flat complex 'samples' array, 'offsets' (n+1) and 'names'.
+    Amplitudes are validated once over the whole array instead of per Waveform.
+    If schedules=True, also returns {name: ScheduleBlock} built with qiskit.pulse
+    (raises ImportError if qiskit.pulse is unavailable).
+    Returns path, or (path, schedules).
+    """
+    if dt is None:
+        dt = 1.0 / (SAMPLE_RATE_GS * 1e9)
+    qp = None
+    if schedules:
+        qp = get_qiskit_pulse()
+        if qp is None:
+            raise ImportError("qiskit.pulse is required for schedules=True")
+
+    names, chunks, lengths = [], [], []
+    seen = set()
+    for batch in batches:
+        for name, samples in _iter_batch(batch):
+            name = str(name)
+            if name in seen:
+                raise ValueError(f"Duplicate waveform name: {name!r}")
+            seen.add(name)
+            samples = np.asarray(samples, dtype=complex).ravel()
+            names.append(name)
+            chunks.append(samples)
+            lengths.append(len(samples))
+    if not names:
+        raise ValueError("No waveforms to export")
+
+    flat = np.concatenate(chunks)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    over = np.abs(flat) > 1.0 + AMPLITUDE_EPS
+    if over.any():
+        bad = np.unique(np.searchsorted(offsets, np.flatnonzero(over), side='right') - 1)
+        raise ValueError("Amplitude exceeds 1 in: " + ", ".join(names[i] for i in bad[:10]))
+
+    np.savez(path, samples=flat, offsets=offsets, names=np.array(names),
+             dt=dt, sample_rate_gs=SAMPLE_RATE_GS)
+    print(f"Saved {path} with {len(names)} waveforms ({len(flat)} samples).")
+    if not schedules:
+        return path
+    return path, build_schedule_bundle(names, flat, offsets, channel=channel, qp=qp)
+
+
+def load_waveform_library(path=LIBRARY_FILE):
+    """Load a library written by export_waveform_library. Returns {name: samples} (views)."""
+    with np.load(path) as data:
+        flat = data['samples']
+        offsets = data['offsets']
+        names = data['names']
+    return {str(n): flat[offsets[i]:offsets[i + 1]] for i, n in enumerate(names)}
+
+
+def build_schedule_bundle(names, flat, offsets, channel=0, qp=None):
+    """Build one ScheduleBlock per waveform, each playing it on DriveChannel(channel)."""
+    qp = qp or get_qiskit_pulse()
+    if qp is None:
+        raise ImportError("qiskit.pulse is required to build schedules")
+    drive = qp.DriveChannel(channel)
+    bundle = {}
+    for i, name in enumerate(names):
+        wf = qp.Waveform(flat[offsets[i]:offsets[i + 1]], name=name, limit_amplitude=False)
+        block = qp.ScheduleBlock(name=name)
+        block.append(qp.Play(wf, drive))
+        bundle[name] = block
+    return bundle
+
 
 def export_pulses_npz(return_bytes=False):
     duration = 160
@@ -49,14 +153,12 @@ def export_pulses_npz(return_bytes=False):
 
     np.savez('phi_pulses.npz', **pulses, duration=duration, dt=dt, sample_rate_gs=SAMPLE_RATE_GS)
     print("Saved phi_pulses.npz with all pulse arrays (duration, dt, sample_rate_gs).")
-    try:
-        from qiskit.pulse.library import Waveform
+    qp = get_qiskit_pulse()
+    if qp is not None:
         for name, samples in pulses.items():
-            wf = Waveform(samples.astype(complex))
+            wf = qp.Waveform(samples.astype(complex))
             np.savez(f"waveform_{name}.npz", samples=wf.samples, duration=duration)
             print(f"  Qiskit Waveform '{name}' -> waveform_{name}.npz")
-    except ImportError:
-        pass
     return 'phi_pulses.npz'
 
 
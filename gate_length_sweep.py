@@ -0,0 +1,100 @@
+"""
+Energy, leakage and IBM alignment score of every pulse family across a whole gate-length range.
+Each duration's seven envelopes are built, line-filtered and analyzed as one stacked batch
+(compute_leakage_metrics_batch), and the alignment score is evaluated for all rows at once with the same
+formula the app's IBM table uses. Results are long-form records (one per duration and family), cached in the
+shared result cache.
+Run: python gate_length_sweep.py [start end]
+"""
+import sys
+import time
+
+import numpy as np
+
+from pulse_comparison import PULSE_NAMES, create_pulse, compute_leakage_metrics_batch, dt_sec
+from pulse_distortion import awg_lowpass
+from result_cache import DEFAULT_PARAMS, CODE_FILES
+
+IBM_RANGE_NS = (10, 50)  # IBM single-qubit gates: Gaussian/DRAG at ~10-50 ns
+MAX_SWEEP_POINTS = 101
+
+
+def sweep_durations(start, end, max_points=MAX_SWEEP_POINTS):
+    """Integer durations from start to end (inclusive), 1 ns apart or coarser to stay within max_points."""
+    step = max(1, -(-(end - start) // (max_points - 1)))
+    return np.unique(np.append(np.arange(start, end + 1, step), end))
+
+
+def alignment_scores(energy, leakage_pct, drag_energy, in_range):
+    """
+    IBM alignment (0-100): 100 minus an energy penalty (0 at or below DRAG, up to 50) and a leakage
+    penalty (10 per leakage %, up to 40), plus 10 inside the gate-length range. 50 without a DRAG reference.
+    """
+    energy, leakage_pct, drag_energy = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                                             for v in (energy, leakage_pct, drag_energy)))
+    ratio = np.divide(energy, drag_energy, out=np.ones_like(energy), where=drag_energy > 0)
+    energy_penalty = np.clip(50 * (ratio - 1), 0, 50)
+    leakage_penalty = np.minimum(40, leakage_pct * 10)
+    score = np.clip(100 - energy_penalty - leakage_penalty + np.where(in_range, 10, 0), 0, 100)
+    return np.where(drag_energy > 0, score, 50.0)
+
+
+def gate_length_sweep(durations, t_min=-6.0, t_max=5.0, sigma_divisor=5, drag_beta=0.1, line_cutoff_ghz=None,
+                      gate_range=IBM_RANGE_NS):
+    """
+    Records {duration, family, energy, energy_vs_drag_pct, leakage_pct, bandwidth_ghz, alignment, in_range}
+    for every duration and family, with the same pulse parameters and line filter as the app.
+    """
+    shape = {'Phi (Golden Ratio)': {'t_min': t_min, 't_max': t_max}, 'Gaussian': {'sigma_divisor': sigma_divisor},
+             'DRAG': {'beta': drag_beta}}
+    line = awg_lowpass(line_cutoff_ghz) if line_cutoff_ghz else None
+    durations = np.asarray(durations, dtype=int)
+    energy = np.empty((len(durations), len(PULSE_NAMES)))
+    leakage, bandwidth = np.empty_like(energy), np.empty_like(energy)
+    for i, d in enumerate(durations):
+        stack = np.stack([create_pulse(n, d, **shape.get(n, {})) for n in PULSE_NAMES])
+        if line is not None:
+            stack = line.apply(stack)
+        energy[i] = np.sum(np.abs(stack)**2, axis=-1)
+        leakage[i], bandwidth[i] = compute_leakage_metrics_batch(stack, dt_sec)
+    drag = energy[:, [PULSE_NAMES.index('DRAG')]]
+    in_range = ((durations >= gate_range[0]) & (durations <= gate_range[1]))[:, None]
+    alignment = alignment_scores(energy, leakage, drag, in_range)
+    vs_drag = np.divide(100 * (energy - drag), drag, out=np.zeros_like(energy), where=drag > 0)
+    in_range = np.broadcast_to(in_range, energy.shape)
+    return [{'duration': int(d), 'family': n, 'energy': float(energy[i, j]), 'energy_vs_drag_pct': float(vs_drag[i, j]),
+             'leakage_pct': float(leakage[i, j]), 'bandwidth_ghz': float(bandwidth[i, j]),
+             'alignment': float(alignment[i, j]), 'in_range': bool(in_range[i, j])}
+            for i, d in enumerate(durations) for j, n in enumerate(PULSE_NAMES)]
+
+
+def cached_sweep(cache, gate_range=IBM_RANGE_NS, **params):
+    """gate_length_sweep over sweep_durations(*gate_range) through a result_cache.ResultCache."""
+    params = {k: v for k, v in dict(DEFAULT_PARAMS, **params).items() if k != 'duration'}
+    key = dict(params, gate_range=list(gate_range))
+    return cache.get_or_compute('gate_length_sweep', key,
+                                lambda: gate_length_sweep(sweep_durations(*gate_range), gate_range=gate_range, **params),
+                                CODE_FILES + ['gate_length_sweep.py'])
+
+
+def best_durations(records):
+    """Per family, the record with the highest alignment (ties: lower energy, then shorter duration)."""
+    best = {}
+    for r in records:
+        b = best.get(r['family'])
+        if b is None or (-r['alignment'], r['energy'], r['duration']) < (-b['alignment'], b['energy'], b['duration']):
+            best[r['family']] = r
+    return [best[n] for n in PULSE_NAMES if n in best]
+
+
+if __name__ == "__main__":
+    start, end = (int(a) for a in sys.argv[1:3]) if len(sys.argv) > 2 else IBM_RANGE_NS
+    t0 = time.time()
+    records = gate_length_sweep(sweep_durations(start, end), gate_range=(start, end))
+    print("="*60)
+    print(f"GATE-LENGTH SWEEP {start}-{end} ns - best duration per family")
+    print("="*60)
+    for r in best_durations(records):
+        print(f"  {r['family']:20s}: {r['duration']:4d} ns  alignment {r['alignment']:5.1f}  "
+              f"energy {r['energy']:7.2f}  leakage {r['leakage_pct']:.4f}%")
+    print(f"{len(records)} points in {time.time() - t0:.2f} s")
@@ -0,0 +1,230 @@
+"""
+Out-of-core analytics over exported waveform libraries (export_waveform_library and phi_pulses-style .npz).
+Arrays are never loaded whole: uncompressed .npz members are memory-mapped in place, compressed ones are
+read range by range. Waveforms are split into blocks of about BLOCK_SAMPLES samples, each block is
+analyzed in a worker process (energy, peak, and compute_leakage_metrics_batch per equal-length group),
+and the results go into a compact summary index. Queries such as "leakage below X and energy below Y"
+are answered from the index alone; files whose size and mtime are unchanged are not re-analyzed.
+Run: python library_analytics.py waveform_library.npz [more.npz ...] [--leakage-max 1 --energy-max 60]
+"""
+import os
+import time
+import zipfile
+import argparse
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pulse_comparison import compute_leakage_metrics_batch, dt_sec
+
+INDEX_FILE = 'library_index.npz'
+BLOCK_SAMPLES = 1 << 20
+METRICS = ['length', 'energy', 'peak', 'leakage_pct', 'bandwidth_ghz']
+
+
+def _member(zf, key):
+    """(shape, dtype, fortran_order, npy header length) of member key.npy, reading only its header."""
+    with zf.open(f'{key}.npy') as f:
+        version = np.lib.format.read_magic(f)
+        read = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran, dtype = read(f)
+        return shape, dtype, fortran, f.tell()
+
+
+def array_info(path):
+    """{key: (shape, dtype)} for every array of an .npz, without reading any data."""
+    with zipfile.ZipFile(path) as zf:
+        keys = [n[:-4] for n in zf.namelist() if n.endswith('.npy')]
+        return {k: _member(zf, k)[:2] for k in keys}
+
+
+def open_array(path, key):
+    """
+    1-D view of array `key`: an np.memmap when the member is stored uncompressed (np.savez), otherwise a
+    _ZipRange that reads slices on demand (np.savez_compressed).
+    """
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(f'{key}.npy')
+        shape, dtype, fortran, header = _member(zf, key)
+    size = int(np.prod(shape))
+    if info.compress_type == zipfile.ZIP_STORED and not fortran:
+        with open(path, 'rb') as f:
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', f.read(4))
+        start = info.header_offset + 30 + name_len + extra_len + header
+        return np.memmap(path, dtype=dtype, mode='r', offset=start, shape=(size,))
+    return _ZipRange(path, key, dtype, size, header)
+
+
+class _ZipRange:
+    """Slice-only access to a compressed .npz member (each read decompresses up to the slice end)."""
+
+    def __init__(self, path, key, dtype, size, header):
+        self.path, self.key, self.dtype, self.header = path, key, dtype, header
+        self.shape = (size,)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, s):
+        start, stop, _ = s.indices(len(self))
+        with zipfile.ZipFile(self.path) as zf, zf.open(f'{self.key}.npy') as f:
+            f.seek(self.header + start * self.dtype.itemsize)
+            return np.frombuffer(f.read((stop - start) * self.dtype.itemsize), dtype=self.dtype)
+
+
+def library_entries(path):
+    """
+    Waveforms in one file as (name, key, start, stop) ranges. An indexed library (samples/offsets/names)
+    gives one entry per name; otherwise every 1-D numeric array with more than one element is a waveform.
+    """
+    info = array_info(path)
+    if {'samples', 'offsets', 'names'} <= set(info):
+        with np.load(path) as z:
+            offsets, names = z['offsets'], z['names']
+        return [(str(n), 'samples', int(offsets[i]), int(offsets[i + 1])) for i, n in enumerate(names)]
+    return [(k, k, 0, shape[0]) for k, (shape, dtype) in info.items()
+            if len(shape) == 1 and shape[0] > 1 and np.issubdtype(dtype, np.number)]
+
+
+def _blocks(entries, block_samples):
+    block, size = [], 0
+    for e in entries:
+        block.append(e)
+        size += e[3] - e[2]
+        if size >= block_samples:
+            yield block
+            block, size = [], 0
+    if block:
+        yield block
+
+
+def analyze_block(path, entries, dt=dt_sec):
+    """METRICS rows (float64) for a list of (name, key, start, stop) entries of one file."""
+    arrays = {key: open_array(path, key) for key in {e[1] for e in entries}}
+    by_length = {}
+    for i, (_, _, start, stop) in enumerate(entries):
+        by_length.setdefault(stop - start, []).append(i)
+    out = np.zeros((len(entries), len(METRICS)))
+    for n, rows in by_length.items():
+        if n == 0:
+            continue
+        stack = np.stack([np.asarray(arrays[key][start:stop]) for _, key, start, stop in (entries[i] for i in rows)])
+        leakage, bandwidth = compute_leakage_metrics_batch(stack, dt)
+        mag2 = np.abs(stack)**2
+        out[rows] = np.column_stack([np.full(len(rows), n), mag2.sum(axis=-1), np.sqrt(mag2.max(axis=-1)),
+                                     leakage, bandwidth])
+    return out
+
+
+def _analyze_job(args):
+    return analyze_block(*args)
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class LibraryIndex:
+    """Summary table (file, name, METRICS) of one or more libraries, with per-file change stamps."""
+
+    def __init__(self, table, stamps):
+        self.table = table
+        self.stamps = stamps  # {absolute path: (size, mtime_ns)}
+
+    def __len__(self):
+        return len(self.table)
+
+    def query(self, **bounds):
+        """
+        Rows within bounds given as <metric>_min / <metric>_max, e.g. query(leakage_pct_max=1, energy_max=60).
+        Answered from the index only.
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        for arg, value in bounds.items():
+            metric, _, side = arg.rpartition('_')
+            if metric not in METRICS or side not in ('min', 'max'):
+                raise ValueError(f"Unknown bound {arg!r}; use <metric>_min/_max with metric in {METRICS}")
+            col = self.table[metric].to_numpy()
+            mask &= col >= value if side == 'min' else col <= value
+        return self.table[mask]
+
+    def save(self, path=INDEX_FILE):
+        files = sorted(self.stamps)
+        file_id = {f: i for i, f in enumerate(files)}
+        np.savez_compressed(path, files=np.array(files, dtype=str),
+                            stamps=np.array([self.stamps[f] for f in files], dtype=np.int64).reshape(-1, 2),
+                            file_id=self.table['file'].map(file_id).to_numpy(dtype=np.int32),
+                            name=self.table['name'].to_numpy(dtype=str),
+                            **{m: self.table[m].to_numpy(dtype=np.float32) for m in METRICS})
+        return path
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with np.load(path) as z:
+            files = [str(f) for f in z['files']]
+            table = pd.DataFrame({'file': np.array(files, dtype=object)[z['file_id']] if files else [],
+                                  'name': z['name'].astype(object), **{m: z[m] for m in METRICS}})
+            stamps = {f: tuple(int(v) for v in s) for f, s in zip(files, z['stamps'])}
+        return cls(table, stamps)
+
+
+def build_index(paths, index_path=INDEX_FILE, workers=None, block_samples=BLOCK_SAMPLES):
+    """
+    Analyze libraries block by block across worker processes (workers=1: in-process) and write the index.
+    Rows of files unchanged since an existing index at index_path are reused. Returns the LibraryIndex.
+    """
+    paths = [os.path.abspath(p) for p in paths]
+    old = LibraryIndex.load(index_path) if index_path and os.path.exists(index_path) else None
+    stamps = {p: _file_stamp(p) for p in paths}
+    kept = [p for p in paths if old is not None and old.stamps.get(p) == stamps[p]]
+    jobs, owners = [], []
+    for p in paths:
+        if p in kept:
+            continue
+        for block in _blocks(library_entries(p), block_samples):
+            jobs.append((p, block))
+            owners.append(p)
+    if workers == 1 or len(jobs) <= 1:
+        results = [_analyze_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_analyze_job, jobs))
+    frames = [old.table[old.table['file'] == p] for p in kept]
+    frames += [pd.DataFrame({'file': p, 'name': [e[0] for e in block], **dict(zip(METRICS, r.T))})
+               for (p, block), r in zip(jobs, results)]
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['file', 'name'] + METRICS)
+    order = {p: i for i, p in enumerate(paths)}
+    table = table.sort_values('file', key=lambda c: c.map(order), kind='stable').reset_index(drop=True)
+    for m in METRICS:
+        table[m] = table[m].astype(np.float32)
+    index = LibraryIndex(table, stamps)
+    if index_path:
+        index.save(index_path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a summary index over waveform libraries and query it.")
+    parser.add_argument('paths', nargs='*', help="library .npz files (omit to query an existing index)")
+    parser.add_argument('--index', default=INDEX_FILE)
+    parser.add_argument('--workers', type=int, default=None)
+    for m in METRICS:
+        parser.add_argument(f"--{m.replace('_', '-')}-min", type=float, dest=f'{m}_min')
+        parser.add_argument(f"--{m.replace('_', '-')}-max", type=float, dest=f'{m}_max')
+    args = parser.parse_args()
+    t0 = time.time()
+    index = build_index(args.paths, args.index, args.workers) if args.paths else LibraryIndex.load(args.index)
+    print(f"Index {args.index}: {len(index)} waveforms from {len(index.stamps)} files ({time.time() - t0:.2f} s)")
+    bounds = {k: v for k, v in vars(args).items() if k.endswith(('_min', '_max')) and v is not None}
+    if bounds:
+        hits = index.query(**bounds)
+        print(f"{len(hits)} match {bounds}")
+        print(hits.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
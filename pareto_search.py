@@ -0,0 +1,158 @@
+"""
+Energy vs leakage vs duration Pareto fronts for each pulse family over its parameter space.
+Candidates are evaluated in vectorized batches (one stacked FFT per duration) with the same energy
+(sum |A|^2) and compute_leakage_metrics definitions as the app. Starting from a coarse grid, each round
+refines only around the current non-dominated points, so dominated regions are never scanned finely.
+Families are searched in parallel processes.
+Run: python pareto_search.py  -> pareto_front.csv
+"""
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pulse_comparison import PULSE_FAMILIES, create_pulse, compute_leakage_metrics_batch, resolve_family, dt_sec
+
+DURATION_RANGE = (10, 500)
+# Searchable shape parameters per family; families not listed only vary duration.
+PARAM_BOUNDS = {
+    'Phi (Golden Ratio)': {'t_min': (-10.0, -1.0), 't_max': (1.0, 10.0)},
+    'Gaussian': {'sigma_divisor': (2.0, 15.0)},
+    'DRAG': {'beta': (0.0, 0.5)},
+    'Gaussian Square': {'flat_fraction': (0.05, 0.95)},
+}
+OBJECTIVES = ['energy', 'leakage_pct', 'duration']
+OUTPUT_FILE = 'pareto_front.csv'
+
+
+def nondominated(points):
+    """Boolean mask of rows not dominated by any other row (all objectives minimized)."""
+    p = np.asarray(points, dtype=float)
+    keep = np.ones(len(p), dtype=bool)
+    for i in range(len(p)):
+        if not keep[i]:
+            continue
+        le = np.all(p <= p[i], axis=1) & np.any(p < p[i], axis=1)
+        if le.any():
+            keep[i] = False
+        else:
+            keep &= ~(np.all(p[i] <= p, axis=1) & np.any(p[i] < p, axis=1))
+    return keep
+
+
+def _axes(family):
+    bounds = PARAM_BOUNDS.get(family, {})
+    names = sorted(bounds)
+    lo = np.array([DURATION_RANGE[0]] + [bounds[n][0] for n in names], dtype=float)
+    hi = np.array([DURATION_RANGE[1]] + [bounds[n][1] for n in names], dtype=float)
+    return names, lo, hi
+
+
+def evaluate(family, names, x):
+    """Objectives for candidate rows x = [duration, *params]. Returns (n, 4): energy, leakage, duration, bandwidth."""
+    out = np.empty((len(x), 4))
+    durations = x[:, 0].astype(int)
+    for d in np.unique(durations):
+        idx = np.flatnonzero(durations == d)
+        stack = np.stack([create_pulse(family, d, **dict(zip(names, x[i, 1:]))) for i in idx])
+        leak, bw = compute_leakage_metrics_batch(stack, dt_sec)
+        out[idx] = np.column_stack([np.sum(stack**2, axis=-1), leak, np.full(len(idx), d), bw])
+    return out
+
+
+def search_family(family, initial_points=6, rounds=5, n_random=2, max_refine=48, seed=0):
+    """
+    Adaptive Pareto search for one family. Returns dict with param names, the evaluated count and
+    the front as arrays x (duration, params) and f (energy, leakage, duration, bandwidth).
+    """
+    family = resolve_family(family)
+    names, lo, hi = _axes(family)
+    rng = np.random.default_rng(seed)
+    span = hi - lo
+
+    def snap(u):
+        x = lo + np.clip(u, 0, 1) * span
+        x[:, 0] = np.round(x[:, 0])
+        x[:, 1:] = np.round(x[:, 1:], 4)
+        return x
+
+    grid = np.meshgrid(*[np.linspace(0, 1, initial_points)] * len(lo), indexing='ij')
+    cand = snap(np.column_stack([g.ravel() for g in grid]))
+    seen, xs, fs = set(), [], []
+    h = 1.0 / (initial_points - 1)
+    for _ in range(rounds + 1):
+        keys = [tuple(r) for r in cand]
+        new = [i for i, k in enumerate(keys) if k not in seen and not seen.add(k)]
+        if not new:
+            break
+        x = cand[new]
+        xs.append(x)
+        fs.append(evaluate(family, names, x))
+        X, F = np.vstack(xs), np.vstack(fs)
+        mask = nondominated(F[:, :3])
+        front = X[mask]
+        if len(front) > max_refine:
+            # Spread the refinement budget evenly along the front (ordered by energy).
+            order = np.argsort(F[mask, 0])
+            front = front[order[np.linspace(0, len(front) - 1, max_refine).astype(int)]]
+        # Refine only around non-dominated points: axis neighbours plus random jitter in the cell.
+        h /= 2
+        u = (front - lo) / np.where(span > 0, span, 1)
+        steps = np.vstack([np.eye(len(lo)), -np.eye(len(lo))]) * h
+        around = (u[:, None, :] + steps[None]).reshape(-1, len(lo))
+        jitter = (u[:, None, :] + rng.uniform(-h, h, (len(u), n_random, len(lo)))).reshape(-1, len(lo))
+        cand = snap(np.vstack([around, jitter]))
+
+    X, F = np.vstack(xs), np.vstack(fs)
+    mask = nondominated(F[:, :3])
+    order = np.lexsort((F[mask, 1], F[mask, 0]))
+    return {'family': family, 'param_names': names, 'evaluated': len(X),
+            'x': X[mask][order], 'f': F[mask][order]}
+
+
+def _search_job(args):
+    return search_family(*args)
+
+
+def search_all(families=None, workers=None, **kwargs):
+    """Pareto fronts for several families, one process per family (workers=1: in-process)."""
+    families = [resolve_family(f) for f in (families or PULSE_FAMILIES)]
+    jobs = [(f, kwargs.get('initial_points', 6), kwargs.get('rounds', 5), kwargs.get('n_random', 2),
+             kwargs.get('max_refine', 48), kwargs.get('seed', 0)) for f in families]
+    if workers == 1:
+        return [_search_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_search_job, jobs))
+
+
+def front_records(results):
+    """Flat rows (one per front point) for tables, charts and CSV."""
+    all_params = sorted({n for r in results for n in r['param_names']})
+    rows = []
+    for r in results:
+        for x, f in zip(r['x'], r['f']):
+            row = {'family': r['family'], 'duration': int(x[0]), 'energy': float(f[0]),
+                   'leakage_pct': float(f[1]), 'bandwidth_ghz': float(f[3])}
+            params = dict(zip(r['param_names'], x[1:]))
+            row.update({n: float(params[n]) if n in params else None for n in all_params})
+            rows.append(row)
+    return rows
+
+
+def save_front_csv(results, path=OUTPUT_FILE):
+    rows = front_records(results)
+    with open(path, 'w', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['family'])
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+if __name__ == "__main__":
+    t0 = time.time()
+    results = search_all()
+    path = save_front_csv(results)
+    for r in results:
+        print(f"  {r['family']:20s}: {len(r['x']):4d} front points from {r['evaluated']} evaluations")
+    print(f"Saved {path} in {time.time() - t0:.1f} s")
@@ -0,0 +1,218 @@
+"""
+Amplitude calibration tables: the drive amplitude (fraction of AWG full scale) at which each pulse family
+rotates |0> by a target angle, over a grid of durations, shape parameters and angles.
+Each grid point is a batched Rabi amplitude scan (P1 vs amplitude, simulated with the piecewise-constant
+propagators under an optional static detuning) inverted on its first rising branch. The table stores the
+ratio to the resonant area-theorem amplitude (exactly 1 without detuning), so multilinear interpolation
+stays accurate between grid nodes. Tables are built in parallel per family and stored as float32 in one .npz.
+Run: python pulse_calibration.py  -> calibration_tables.npz
+"""
+import time
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pulse_comparison import PULSE_FAMILIES, FAMILY_KEYS, create_pulse, resolve_family, dt_sec
+from quantum_propagators import slice_propagators, chain_product, mhz_to_rad_s
+
+FULL_SCALE_RABI_MHZ = 50.0  # Rabi frequency at amplitude 1.0
+DURATIONS = np.arange(10, 501, 10)
+ANGLES_DEG = np.arange(0, 181, 5)
+# Shape-parameter grid per family (defaults are grid nodes); families not listed only vary duration.
+PARAM_AXES = {
+    'Phi (Golden Ratio)': {'t_min': [-10, -8, -6, -4, -2, 0], 't_max': [0, 1, 3, 5, 7, 10]},
+    'Gaussian': {'sigma_divisor': [2, 3, 4, 5, 6, 8, 10, 15]},
+    'DRAG': {'beta': [0, 0.05, 0.1, 0.2, 0.3, 0.5], 'sigma_divisor': [3, 4, 5, 6, 8]},
+    'Gaussian Square': {'flat_fraction': [0.05, 0.25, 0.5, 0.75, 0.95]},
+}
+AMPLITUDE_POINTS = 81
+SCAN_HEADROOM = 1.25  # scan up to the amplitude of a resonant 1.25 pi rotation (the pi amplitude is a node)
+OUTPUT_FILE = 'calibration_tables.npz'
+# Sources the tables depend on: cached tables are rebuilt only when one of these changes.
+TABLE_CODE_FILES = ['pulse_comparison.py', 'quantum_propagators.py', 'pulse_calibration.py']
+
+_KEY_OF = {name: key for key, name in FAMILY_KEYS.items()}
+
+
+def excited_population(samples, amplitudes, detuning_mhz=0.0, dt=dt_sec):
+    """P1 after driving |0> with amplitudes[..., None] * samples (samples broadcast against amplitudes)."""
+    omega = 2 * np.pi * FULL_SCALE_RABI_MHZ * 1e6 * np.asarray(amplitudes)[..., None] * samples
+    u = chain_product(slice_propagators(omega, 0.0, mhz_to_rad_s(detuning_mhz), dt))
+    return np.abs(u[..., 1, 0])**2
+
+
+def resonant_amplitude(area, angle):
+    """Area theorem: amplitude rotating by angle (rad) on resonance, for an envelope with sum(samples) = area."""
+    return angle / (2 * np.pi * FULL_SCALE_RABI_MHZ * 1e6 * dt_sec * np.abs(area))
+
+
+@lru_cache(maxsize=4096)
+def _envelope_area(family, duration, params):
+    return float(np.sum(create_pulse(family, duration, **dict(params))))
+
+
+def _invert_scan(amps, p1, angles):
+    """Amplitudes reaching each angle on the first rising branch of the scan (NaN if never reached)."""
+    theta = 2 * np.arcsin(np.sqrt(np.clip(p1, 0, 1)))
+    falling = np.flatnonzero(np.diff(theta) <= 0)
+    stop = falling[0] + 1 if len(falling) else len(theta)
+    a = np.interp(angles, theta[:stop], amps[:stop])
+    return np.where(angles <= theta[stop - 1] + 1e-6, a, np.nan)
+
+
+def calibrate_family(family, durations=DURATIONS, angles_deg=ANGLES_DEG, param_axes=None,
+                     detuning_mhz=0.0, amplitude_points=AMPLITUDE_POINTS):
+    """CalibrationTable for one family; one batched amplitude scan per (duration, parameter combination)."""
+    family = resolve_family(family)
+    param_axes = PARAM_AXES.get(family, {}) if param_axes is None else param_axes
+    names = sorted(param_axes)
+    values = [np.asarray(param_axes[n], dtype=float) for n in names]
+    combos = np.array(np.meshgrid(*values, indexing='ij')).reshape(len(names), -1).T if names else np.empty((1, 0))
+    angles = np.radians(np.asarray(angles_deg, dtype=float))
+    durations = np.asarray(durations, dtype=int)
+    u = np.linspace(0, SCAN_HEADROOM, amplitude_points)
+    table = np.empty((len(durations), len(combos), len(angles)))
+    for i, d in enumerate(durations):
+        stack = np.stack([create_pulse(family, d, **dict(zip(names, c))) for c in combos])
+        # Scan relative to each shape's resonant pi amplitude so every scan covers the same angle range.
+        a_pi = resonant_amplitude(stack.sum(axis=1), np.pi)
+        amps = a_pi[:, None] * u
+        p1 = excited_population(stack[:, None, :], amps, detuning_mhz)
+        for j in range(len(combos)):
+            a = _invert_scan(amps[j], p1[j], angles)
+            # Ratio to the resonant amplitude; at angle 0 take the small-angle limit from the next node.
+            ratio = np.divide(a, a_pi[j] * angles / np.pi, out=np.full_like(a, np.nan), where=angles > 0)
+            ratio[angles == 0] = ratio[1] if len(angles) > 1 else 1.0
+            table[i, j] = ratio
+    table = table.reshape((len(durations),) + tuple(map(len, values)) + (len(angles),))
+    axes = [('duration', durations.astype(float))] + list(zip(names, values)) + [('angle_deg', np.asarray(angles_deg, float))]
+    return CalibrationTable(family, axes, table.astype(np.float32), detuning_mhz)
+
+
+class CalibrationTable:
+    """
+    Calibrated amplitudes of one family on a regular grid. axes: [(name, values)] with duration first and
+    angle_deg last; values holds the ratio to resonant_amplitude(). Shape parameters not on the grid must be
+    at their defaults.
+    """
+
+    def __init__(self, family, axes, values, detuning_mhz=0.0):
+        self.family = family
+        self.axes = [(n, np.asarray(v, dtype=float)) for n, v in axes]
+        self.values = np.asarray(values)
+        self.detuning_mhz = float(detuning_mhz)
+        self._defaults = PULSE_FAMILIES[family][1]
+
+    @property
+    def param_names(self):
+        return [n for n, _ in self.axes[1:-1]]
+
+    def amplitude(self, duration, angle_deg, **params):
+        """Amplitude (fraction of full scale) for a rotation of angle_deg; arrays broadcast. NaN if unreachable."""
+        unknown = set(params) - set(self._defaults)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {self.family}: {sorted(unknown)}")
+        for n, v in params.items():
+            if n not in self.param_names and not np.all(np.asarray(v) == self._defaults[n]):
+                raise ValueError(f"{self.family} table is calibrated at {n}={self._defaults[n]} only")
+        point = [duration] + [params.get(n, self._defaults[n]) for n in self.param_names] + [angle_deg]
+        point = np.broadcast_arrays(*(np.asarray(p, dtype=float) for p in point))
+        idx, frac = [], []
+        for (name, grid), x in zip(self.axes, point):
+            if np.any(x < grid[0]) or np.any(x > grid[-1]):
+                raise ValueError(f"{name} outside calibrated range [{grid[0]:g}, {grid[-1]:g}]")
+            i = np.clip(np.searchsorted(grid, x, side='right') - 1, 0, len(grid) - 2)
+            idx.append(i)
+            frac.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+        out = 0.0
+        for corner in range(1 << len(idx)):
+            w, at = 1.0, []
+            for k, (i, f) in enumerate(zip(idx, frac)):
+                up = (corner >> k) & 1
+                w = w * (f if up else 1 - f)
+                at.append(i + up)
+            out = out + w * self.values[tuple(at)]
+        full = [params.get(n, self._defaults[n]) for n in sorted(self._defaults)]
+        grid = np.broadcast_arrays(point[0], *(np.asarray(v, dtype=float) for v in full))
+        area = np.array([_envelope_area(self.family, int(round(d)), tuple(zip(sorted(self._defaults), map(float, v))))
+                         for d, *v in zip(*(g.ravel() for g in grid))]).reshape(grid[0].shape)
+        out = out * resonant_amplitude(area, np.radians(point[-1]))
+        return float(out) if np.ndim(out) == 0 else out
+
+
+def _calibrate_job(args):
+    return calibrate_family(*args)
+
+
+def build_tables(families=None, workers=None, detuning_mhz=0.0, durations=DURATIONS, angles_deg=ANGLES_DEG):
+    """
+    Tables for several families, one process per family (workers=1: in-process). Returns {family: table}.
+    Workers are spawned, not forked, so this is safe to call from a multi-threaded server.
+    """
+    families = [resolve_family(f) for f in (families or PULSE_FAMILIES)]
+    jobs = [(f, durations, angles_deg, None, detuning_mhz) for f in families]
+    if workers == 1:
+        tables = [_calibrate_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as ex:
+            tables = list(ex.map(_calibrate_job, jobs))
+    return {t.family: t for t in tables}
+
+
+def resonant_table(family, durations=DURATIONS, angles_deg=ANGLES_DEG, param_axes=None):
+    """
+    Table without detuning, where every ratio is exactly 1: only the corners of the grid are stored and
+    nothing is simulated. Same calibrated range as calibrate_family() over the same axes.
+    """
+    family = resolve_family(family)
+    param_axes = PARAM_AXES.get(family, {}) if param_axes is None else param_axes
+    axes = [('duration', [min(durations), max(durations)])]
+    axes += [(n, [min(param_axes[n]), max(param_axes[n])]) for n in sorted(param_axes)]
+    axes += [('angle_deg', [min(angles_deg), max(angles_deg)])]
+    return CalibrationTable(family, axes, np.ones((2,) * len(axes), dtype=np.float32))
+
+
+def cached_tables(cache, detuning_mhz=0.0):
+    """
+    All families' tables through a result_cache.ResultCache (built once per TABLE_CODE_FILES version).
+    Without detuning the resonant tables are returned directly; there is nothing to build or cache.
+    """
+    if not detuning_mhz:
+        return {f: resonant_table(f) for f in PULSE_FAMILIES}
+    return cache.get_or_compute('calibration_tables', {'detuning_mhz': float(detuning_mhz)},
+                                lambda: build_tables(detuning_mhz=detuning_mhz), TABLE_CODE_FILES)
+
+
+def save_tables(tables, path=OUTPUT_FILE):
+    arrays = {}
+    for family, t in tables.items():
+        key = _KEY_OF[family]
+        arrays[f'{key}/values'] = t.values
+        arrays[f'{key}/detuning_mhz'] = np.float32(t.detuning_mhz)
+        arrays[f'{key}/axes'] = np.array([n for n, _ in t.axes])
+        for n, v in t.axes:
+            arrays[f'{key}/axis/{n}'] = v
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_tables(path=OUTPUT_FILE):
+    tables = {}
+    with np.load(path) as z:
+        for key, family in FAMILY_KEYS.items():
+            if f'{key}/values' not in z:
+                continue
+            axes = [(str(n), z[f'{key}/axis/{n}']) for n in z[f'{key}/axes']]
+            tables[family] = CalibrationTable(family, axes, z[f'{key}/values'], float(z[f'{key}/detuning_mhz']))
+    return tables
+
+
+if __name__ == "__main__":
+    t0 = time.time()
+    tables = build_tables()
+    path = save_tables(tables)
+    for family, t in tables.items():
+        print(f"  {family:20s}: {t.values.size:7d} points, pi/2 @ 160 ns -> {t.amplitude(160, 90):.4f} FS")
+    print(f"Saved {path} in {time.time() - t0:.1f} s")
@@ -29,17 +29,17 @@ def create_golden_ratio_pulse(duration, t_min=-6, t_max=5):
     return create_phi_pulse(duration, t_min, t_max)
 
 
-def create_gaussian_pulse(duration):
-    """Standard Gaussian envelope."""
-    sigma = duration / 5
+def create_gaussian_pulse(duration, sigma_divisor=5):
+    """Standard Gaussian envelope (sigma = duration / sigma_divisor)."""
+    sigma = duration / sigma_divisor
     t = np.linspace(-duration/2, duration/2, duration)
     samples = np.exp(-(t**2) / (2 * sigma**2))
     return samples / np.max(np.abs(samples))
 
 
-def create_drag_pulse(duration, beta=0.1):
+def create_drag_pulse(duration, beta=0.1, sigma_divisor=5):
     """DRAG: Derivative Removal by Adiabatic Gate."""
-    sigma = duration / 5
+    sigma = duration / sigma_divisor
     t = np.linspace(-duration/2, duration/2, duration)
     gauss = np.exp(-(t**2) / (2 * sigma**2))
     derivative = -t / (sigma**2) * gauss
@@ -73,12 +73,63 @@ def create_gaussian_square_pulse(duration, flat_fraction=0.5):
     t = np.linspace(-duration/2, duration/2, duration)
     flat_samples = int(duration * (1 - flat_fraction) / 2)
     rise = np.exp(-(t[:flat_samples]**2) / (2 * sigma**2))
-    fall = np.exp(-(t[-flat_samples:]**2) / (2 * sigma**2))
+    fall = np.exp(-(t[duration - flat_samples:]**2) / (2 * sigma**2))
     flat = np.ones(duration - 2 * flat_samples)
     samples = np.concatenate([rise, flat, fall])
     return samples / np.max(np.abs(samples))
 
 
+PULSE_NAMES = ['Phi (Golden Ratio)', 'Gaussian', 'DRAG', 'Square', 'Sinc',
+               'Raised Cosine', 'Gaussian Square']
+
+
+# Family name -> (generator, default shape parameters). Generators take duration first.
+PULSE_FAMILIES = {
+    'Phi (Golden Ratio)': (create_phi_pulse, {'t_min': -6, 't_max': 5}),
+    'Gaussian': (create_gaussian_pulse, {'sigma_divisor': 5}),
+    'DRAG': (create_drag_pulse, {'beta': 0.1, 'sigma_divisor': 5}),
+    'Square': (create_square_pulse, {}),
+    'Sinc': (create_sinc_pulse, {}),
+    'Raised Cosine': (create_raised_cosine_pulse, {}),
+    'Gaussian Square': (create_gaussian_square_pulse, {'flat_fraction': 0.5}),
+}
+# Short keys as used in exported files (phi, gaussian, drag, ...).
+FAMILY_KEYS = {'phi': 'Phi (Golden Ratio)', 'gaussian': 'Gaussian', 'drag': 'DRAG', 'square': 'Square',
+               'sinc': 'Sinc', 'raised_cosine': 'Raised Cosine', 'gaussian_square': 'Gaussian Square'}
+
+
+def resolve_family(family):
+    """Canonical family name from a display name or short key; raises ValueError if unknown."""
+    if family in PULSE_FAMILIES:
+        return family
+    key = str(family).strip().lower().replace(' ', '_').replace('-', '_')
+    if key in FAMILY_KEYS:
+        return FAMILY_KEYS[key]
+    raise ValueError(f"Unknown pulse family: {family!r}")
+
+
+def create_pulse(family, duration, **params):
+    """Create any family's pulse; unspecified shape parameters take their defaults."""
+    func, defaults = PULSE_FAMILIES[resolve_family(family)]
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {family}: {sorted(unknown)}")
+    return func(int(duration), **dict(defaults, **params))
+
+
+def build_pulses(duration=160, t_min=-6, t_max=5, sigma_divisor=5, drag_beta=0.1):
+    """All seven pulse types for one configuration, keyed by PULSE_NAMES."""
+    return {
+        'Phi (Golden Ratio)': create_phi_pulse(duration, t_min, t_max),
+        'Gaussian': create_gaussian_pulse(duration, sigma_divisor),
+        'DRAG': create_drag_pulse(duration, drag_beta),
+        'Square': create_square_pulse(duration),
+        'Sinc': create_sinc_pulse(duration),
+        'Raised Cosine': create_raised_cosine_pulse(duration),
+        'Gaussian Square': create_gaussian_square_pulse(duration),
+    }
+
+
 def compute_leakage_metrics(samples, dt=1e-9, high_freq_threshold_frac=0.2):
     """Compute leakage % and bandwidth at -40dB. Returns (leakage_pct, bandwidth_GHz)."""
     freqs, psd = get_spectral_energy(samples, dt)
@@ -94,6 +145,25 @@ def compute_leakage_metrics(samples, dt=1e-9, high_freq_threshold_frac=0.2):
     return leakage, bandwidth
 
 
+def compute_leakage_metrics_batch(samples, dt=1e-9, high_freq_threshold_frac=0.2):
+    """compute_leakage_metrics for every row of a (batch, n) array. Returns (leakage_pct, bandwidth_GHz) arrays."""
+    samples = np.atleast_2d(samples)
+    n = samples.shape[-1]
+    freqs = fftshift(fftfreq(n, dt)) / 1e9
+    psd = 20 * np.log10(np.abs(fftshift(fft(samples, axis=-1), axes=-1)) + 1e-15)
+    psd -= np.max(psd, axis=-1, keepdims=True)
+    nyquist = 0.5 * SAMPLE_RATE_GS
+    mask = np.abs(freqs) > high_freq_threshold_frac * nyquist
+    psd_linear = 10 ** (psd / 10)
+    total = np.sum(psd_linear, axis=-1)
+    high = np.sum(psd_linear[:, mask], axis=-1)
+    leakage = np.divide(high, total, out=np.zeros_like(total), where=total > 0) * 100
+    below = psd < -40
+    edge = np.max(np.where(below, np.abs(freqs), -np.inf), axis=-1)
+    bandwidth = np.where(below.any(axis=-1), 2 * edge, nyquist * 2)
+    return leakage, bandwidth
+
+
 def get_spectral_energy(samples, dt=1e-9):
     """Compute PSD. Returns (freq_GHz, psd_dB)."""
     n = len(samples)
@@ -0,0 +1,119 @@
+"""
+AWG / reconstruction-filter / cabling distortion between the pulse generators and the metrics/simulator.
+A line is an FIR impulse response (given directly, from IIR second-order sections, or from a measured
+frequency response) applied with FFT overlap-add, so long sequences filter in O(n log m).
+inverse() gives a regularized pre-distortion filter.
+"""
+import numpy as np
+from scipy.fft import fft, ifft, irfft, rfftfreq
+from scipy.signal import oaconvolve, sosfilt, butter, freqz
+
+from pulse_comparison import SAMPLE_RATE_GS
+
+
+class LineDistortion:
+    """
+    Linear line model y = h * x. `delay` samples of the filter's bulk delay are removed from
+    the output, so apply() returns an output aligned with and as long as its input.
+    """
+
+    def __init__(self, taps, delay=0):
+        self.taps = np.asarray(taps, dtype=float).ravel()
+        if len(self.taps) == 0:
+            raise ValueError("taps must be non-empty")
+        if not 0 <= delay < len(self.taps):
+            raise ValueError(f"delay must be in [0, {len(self.taps) - 1}]")
+        self.delay = int(delay)
+
+    @classmethod
+    def from_fir(cls, taps, delay=0):
+        return cls(taps, delay)
+
+    @classmethod
+    def from_sos(cls, sos, n_taps=None, tol=1e-10, max_taps=1 << 16):
+        """IIR sections -> impulse response, truncated once the remaining energy falls below tol."""
+        n = n_taps or max_taps
+        h = sosfilt(sos, np.r_[1.0, np.zeros(n - 1)])
+        if n_taps is None:
+            tail = np.cumsum((h**2)[::-1])[::-1]
+            keep = np.flatnonzero(tail > tol * tail[0])
+            h = h[:keep[-1] + 1 if len(keep) else 1]
+        return cls(h)
+
+    @classmethod
+    def from_response(cls, freqs_ghz, response, n_taps=256):
+        """Measured complex response H(f) (f >= 0, GHz) -> n_taps FIR with n_taps // 2 bulk delay."""
+        grid = rfftfreq(n_taps, 1 / SAMPLE_RATE_GS)
+        freqs_ghz = np.asarray(freqs_ghz, dtype=float)
+        response = np.asarray(response, dtype=complex)
+        mag = np.interp(grid, freqs_ghz, np.abs(response))
+        phase = np.interp(grid, freqs_ghz, np.unwrap(np.angle(response)))
+        h = irfft(mag * np.exp(1j * phase), n_taps)
+        return cls(np.roll(h, n_taps // 2), delay=n_taps // 2)
+
+    def response(self, freqs_ghz):
+        """Complex response at the given frequencies (GHz), including the removed delay."""
+        w = 2 * np.pi * np.asarray(freqs_ghz, dtype=float) / SAMPLE_RATE_GS
+        _, h = freqz(self.taps, worN=w)
+        return h * np.exp(1j * w * self.delay)
+
+    def apply(self, samples):
+        """Distort one waveform or a (batch, n) stack along the last axis; same shape out."""
+        x = np.asarray(samples)
+        n = x.shape[-1]
+        taps = self.taps.reshape((1,) * (x.ndim - 1) + (-1,))
+        y = oaconvolve(x, taps, mode='full', axes=-1)
+        return y[..., self.delay:self.delay + n]
+
+    def apply_stream(self, chunks):
+        """Overlap-add over an iterable of 1-D chunks (e.g. memory-mapped blocks); yields output chunks."""
+        m = len(self.taps)
+        carry = np.zeros(m - 1)
+        skip = self.delay
+        for chunk in chunks:
+            chunk = np.asarray(chunk)
+            if len(chunk) == 0:
+                continue
+            y = oaconvolve(chunk, self.taps, mode='full')
+            if np.iscomplexobj(y) and not np.iscomplexobj(carry):
+                carry = carry.astype(complex)
+            y[:m - 1] += carry
+            out, carry = y[:len(chunk)], y[len(chunk):]
+            if skip:
+                drop = min(skip, len(out))
+                out, skip = out[drop:], skip - drop
+            yield out
+        yield carry[skip:self.delay]
+
+    def inverse(self, n_taps=None, regularization=1e-3):
+        """
+        Regularized pre-distortion filter: apply it before the line so the line output matches.
+        Pad waveforms with zeros first; the pre-distorted signal rings outside the original window.
+        """
+        n = n_taps or max(256, 4 * len(self.taps))
+        h = np.zeros(n)
+        h[:min(n, len(self.taps))] = self.taps[:n]
+        H = fft(np.roll(h, -self.delay))
+        Hinv = np.conj(H) / (np.abs(H)**2 + regularization * np.max(np.abs(H))**2)
+        g = np.real(ifft(Hinv))
+        return LineDistortion(np.roll(g, n // 2), delay=n // 2)
+
+    def predistort(self, samples, **kwargs):
+        return self.inverse(**kwargs).apply(samples)
+
+
+def awg_lowpass(cutoff_ghz, order=4):
+    """Butterworth reconstruction-filter model at SAMPLE_RATE_GS."""
+    return LineDistortion.from_sos(butter(order, cutoff_ghz, fs=SAMPLE_RATE_GS, output='sos'))
+
+
+def distort_pulses(pulses, line):
+    """Apply one line model to a dict {name: samples}, batching equal-length pulses."""
+    by_len = {}
+    for name, s in pulses.items():
+        by_len.setdefault(len(s), []).append(name)
+    out = {}
+    for names in by_len.values():
+        y = line.apply(np.stack([pulses[n] for n in names]))
+        out.update(zip(names, y))
+    return {n: out[n] for n in pulses}
@@ -0,0 +1,131 @@
+"""
+Gate sequences built from pulse_comparison envelopes: gates with drive phases, delays and virtual-Z frames.
+Each distinct gate (shape, parameters, angle, noise) is simulated once at phase 0; phases and frames are
+applied exactly as Z conjugations, so a long schedule costs O(distinct gates) propagators plus one
+log-depth product. render_samples() writes the complex sample stream straight into one output buffer.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from pulse_comparison import create_pulse, resolve_family, dt_sec
+from quantum_propagators import pulse_unitary, chain_product, rz, mhz_to_rad_s, rotation_rates
+from pulse_calibration import FULL_SCALE_RABI_MHZ
+
+
+@dataclass(frozen=True)
+class Gate:
+    """Envelope of `family` calibrated to rotate by `angle` about cos(phase) X + sin(phase) Y."""
+    family: str
+    angle: float = np.pi / 2
+    phase: float = 0.0
+    duration: int = 160
+    params: tuple = ()
+
+
+@dataclass(frozen=True)
+class Delay:
+    duration: int
+
+
+@dataclass(frozen=True)
+class VirtualZ:
+    """Frame change: acts as an ideal Z rotation by `angle` at zero duration."""
+    angle: float
+
+
+def make_gate(family, angle=np.pi / 2, phase=0.0, duration=160, **params):
+    return Gate(resolve_family(family), float(angle), float(phase), int(duration), tuple(sorted(params.items())))
+
+
+def schedule_duration(schedule):
+    """Total length in samples."""
+    return sum(el.duration for el in schedule if not isinstance(el, VirtualZ))
+
+
+def _envelope(gate, cache):
+    key = (gate.family, gate.duration, gate.params)
+    if key not in cache:
+        env = create_pulse(gate.family, gate.duration, **dict(gate.params))
+        env.setflags(write=False)
+        cache[key] = env
+    return cache[key]
+
+
+class SequenceSimulator:
+    """Propagators for schedules under a static detuning and relative amplitude error."""
+
+    def __init__(self, detuning_mhz=0.0, amplitude_error=0.0, dt=dt_sec):
+        self.detuning = float(mhz_to_rad_s(detuning_mhz))
+        self.amplitude_error = amplitude_error
+        self.dt = dt
+        self._envelopes = {}
+        self._unitaries = {}
+
+    def gate_unitary(self, gate):
+        """Phase-0 propagator of a gate, simulated once per (shape, parameters, angle)."""
+        key = (gate.family, gate.duration, gate.params, gate.angle)
+        if key not in self._unitaries:
+            self._unitaries[key] = pulse_unitary(_envelope(gate, self._envelopes), gate.angle, 0.0,
+                                                 self.detuning, self.amplitude_error, self.dt)
+        return self._unitaries[key]
+
+    @property
+    def cache_size(self):
+        return len(self._unitaries)
+
+    def element_unitaries(self, schedule):
+        """(n, 2, 2) propagators of the gates and delays in order, plus the final frame angle."""
+        frame = 0.0
+        base, phases = [], []
+        for el in schedule:
+            if isinstance(el, VirtualZ):
+                frame += el.angle
+            elif isinstance(el, Delay):
+                base.append(rz(self.detuning * el.duration * self.dt))
+                phases.append(0.0)
+            else:
+                base.append(self.gate_unitary(el))
+                phases.append(el.phase - frame)
+        if not base:
+            return np.eye(2, dtype=complex)[None], frame
+        u = np.array(base)
+        # rz(p) U rz(-p): off-diagonals pick up exp(-+ i p); diagonals unchanged
+        ph = np.exp(-1j * np.array(phases))
+        u[:, 0, 1] *= ph
+        u[:, 1, 0] *= np.conj(ph)
+        return u, frame
+
+    def unitary(self, schedule):
+        """Total propagator of the schedule (including the final virtual-Z frame)."""
+        u, frame = self.element_unitaries(schedule)
+        return rz(frame) @ chain_product(u)
+
+
+def render_samples(schedule, out=None, full_scale_rabi_mhz=FULL_SCALE_RABI_MHZ, dt=dt_sec):
+    """
+    Complex AWG samples A(t) exp(i phase) for the whole schedule. Each gate is scaled by pulse area exactly
+    as SequenceSimulator drives it (rotation_rates), with amplitude 1.0 = full_scale_rabi_mhz Rabi frequency,
+    so the stream reproduces the simulated propagator. Written in place into `out` (e.g. an np.memmap) if given.
+    """
+    n = schedule_duration(schedule)
+    if out is None:
+        out = np.zeros(n, dtype=complex)
+    elif len(out) < n:
+        raise ValueError(f"Output buffer holds {len(out)} samples, schedule needs {n}")
+    envelopes, scaled = {}, {}
+    full_scale = 2 * np.pi * full_scale_rabi_mhz * 1e6
+    frame, pos = 0.0, 0
+    for el in schedule:
+        if isinstance(el, VirtualZ):
+            frame += el.angle
+        elif isinstance(el, Delay):
+            out[pos:pos + el.duration] = 0
+            pos += el.duration
+        else:
+            key = (el.family, el.duration, el.params, el.angle)
+            if key not in scaled:
+                scaled[key] = rotation_rates(_envelope(el, envelopes), el.angle, dt) / full_scale
+            np.multiply(scaled[key], np.exp(1j * (el.phase - frame)), out=out[pos:pos + el.duration])
+            pos += el.duration
+    return out
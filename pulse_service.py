@@ -0,0 +1,289 @@
+"""
+Local HTTP/JSON compute service for pulse envelopes, energy/leakage metrics and the Bloch simulator.
+Concurrent requests are coalesced into vectorized batches (stacked FFTs, prefix sums).
+Run: python pulse_service.py --port 8765
+Endpoints:
+  POST /pulses    {"items": [{"family": "DRAG", "duration": 160, "params": {"beta": 0.2}}, ...]}
+  POST /metrics   same items (or {"samples": [...]}) -> energy, leakage_pct, bandwidth_ghz
+  POST /simulate  same items plus "target_angle_deg" (and optional "resolution" for the
+                  Bloch trajectory) -> effective angle and final Bloch vector
+  GET  /stats     throughput, latency percentiles and mean batch size
+  GET  /health
+A single item may be posted without the "items" list. POST /pulses with
+"Accept: application/octet-stream" (or ?format=npy) streams a .npy array instead of JSON.
+"""
+import io
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from pulse_comparison import create_pulse, resolve_family, compute_leakage_metrics_batch, dt_sec
+from bloch_trajectory import cumulative_angles
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BATCH = 512
+MAX_WAIT_SEC = 0.002
+STREAM_CHUNK = 1 << 20
+
+
+class ServiceStats:
+    """Request counts, latency percentiles and batch sizes."""
+
+    def __init__(self, window=2048):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}
+        self.items = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=window)
+
+    def record_request(self, endpoint, latency, n_items):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.items += n_items
+            self.latencies.append(latency)
+
+    def record_batch(self):
+        with self._lock:
+            self.batches += 1
+
+    def snapshot(self):
+        with self._lock:
+            lat = np.array(self.latencies) * 1e3
+            elapsed = time.time() - self.started
+            n_req = sum(self.requests.values())
+            return {
+                'uptime_sec': elapsed,
+                'requests': dict(self.requests),
+                'items': self.items,
+                'batches': self.batches,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+                'requests_per_sec': n_req / elapsed if elapsed > 0 else 0.0,
+                'items_per_sec': self.items / elapsed if elapsed > 0 else 0.0,
+                'latency_ms': {
+                    'p50': float(np.percentile(lat, 50)) if len(lat) else 0.0,
+                    'p95': float(np.percentile(lat, 95)) if len(lat) else 0.0,
+                    'max': float(lat.max()) if len(lat) else 0.0,
+                },
+            }
+
+
+def _spec_key(item):
+    """Hashable (family, duration, params) for an item that names a family."""
+    params = item.get('params') or {}
+    return (resolve_family(item['family']), int(item['duration']), tuple(sorted(params.items())))
+
+
+def process_batch(jobs):
+    """
+    Compute a batch of jobs, each (kind, item) with kind in {'pulse', 'metrics', 'simulate'}.
+    Identical pulse specs are generated once; equal-length pulses share one stacked FFT / prefix sum.
+    Returns a list of results (dicts, or exceptions for failed items) in job order.
+    """
+    results = [None] * len(jobs)
+    generated = {}
+    samples = []
+    targets, resolutions = {}, {}
+    for i, (kind, item) in enumerate(jobs):
+        try:
+            if kind == 'simulate':
+                targets[i] = np.radians(float(item.get('target_angle_deg', 90)))
+                if 'resolution' in item:
+                    resolutions[i] = int(item['resolution'])
+                    if resolutions[i] < 0:
+                        raise ValueError("resolution must be >= 0")
+            if 'samples' in item:
+                s = np.asarray(item['samples'], dtype=float)
+            else:
+                key = _spec_key(item)
+                if key not in generated:
+                    generated[key] = create_pulse(key[0], key[1], **dict(key[2]))
+                s = generated[key]
+            if s.ndim != 1 or len(s) == 0:
+                raise ValueError("samples must be a non-empty 1-D array")
+            samples.append(s)
+        except Exception as e:
+            results[i] = e
+            samples.append(None)
+
+    by_len = {}
+    for i, s in enumerate(samples):
+        if s is not None:
+            by_len.setdefault(len(s), []).append(i)
+
+    for idx in by_len.values():
+        stack = np.stack([samples[i] for i in idx])
+        energy = np.sum(np.abs(stack)**2, axis=-1)
+        need = {jobs[i][0] for i in idx}
+        if 'metrics' in need:
+            leak, bw = compute_leakage_metrics_batch(stack, dt_sec)
+        if 'simulate' in need:
+            target = np.array([targets.get(i, 0.0) for i in idx])
+            eff = target * (energy / stack.shape[-1]) / 0.5
+            final = np.where(energy > 0, target, 0.0)
+        for row, i in enumerate(idx):
+            kind = jobs[i][0]
+            if kind == 'pulse':
+                results[i] = {'samples': samples[i]}
+            elif kind == 'metrics':
+                results[i] = {'energy': float(energy[row]), 'leakage_pct': float(leak[row]),
+                              'bandwidth_ghz': float(bw[row])}
+            else:
+                a = final[row]
+                results[i] = {'effective_angle_deg': float(np.degrees(eff[row])),
+                              'final_angle_deg': float(np.degrees(a)),
+                              'bloch': [0.0, float(-np.sin(a)), float(np.cos(a))]}
+                if i in resolutions:
+                    angles, _ = cumulative_angles(stack[row], target[row], resolutions[i])
+                    results[i]['trajectory'] = np.stack(
+                        [np.zeros_like(angles), -np.sin(angles), np.cos(angles)], axis=-1).tolist()
+    return results
+
+
+class BatchCoalescer:
+    """Collects jobs from concurrent request threads and runs them as one batch."""
+
+    def __init__(self, process=process_batch, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SEC, stats=None):
+        self.process = process
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = stats
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='pulse-batcher')
+        self._thread.start()
+
+    def submit(self, kind, item):
+        fut = Future()
+        self._queue.put((kind, item, fut))
+        return fut
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                results = self.process([(k, it) for k, it, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            if self.stats is not None:
+                self.stats.record_batch()
+            for (_, _, fut), res in zip(batch, results):
+                if isinstance(res, Exception):
+                    fut.set_exception(res)
+                else:
+                    fut.set_result(res)
+
+
+class PulseRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'PulseService/1.0'
+    ENDPOINTS = {'/pulses': 'pulse', '/metrics': 'metrics', '/simulate': 'simulate'}
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', True):
+            super().log_message(format, *args)
+
+    def _send_json(self, obj, status=200):
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_npy(self, arr):
+        buf = io.BytesIO()
+        np.save(buf, arr, allow_pickle=False)
+        view = buf.getbuffer()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(view)))
+        self.end_headers()
+        for start in range(0, len(view), STREAM_CHUNK):
+            self.wfile.write(view[start:start + STREAM_CHUNK])
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/stats':
+            self._send_json(self.server.stats.snapshot())
+        elif path == '/health':
+            self._send_json({'status': 'ok'})
+        else:
+            self._send_json({'error': f'Unknown endpoint {path}'}, 404)
+
+    def do_POST(self):
+        t0 = time.perf_counter()
+        url = urlparse(self.path)
+        kind = self.ENDPOINTS.get(url.path)
+        if kind is None:
+            self._send_json({'error': f'Unknown endpoint {url.path}'}, 404)
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise TypeError('Request body must be a JSON object')
+            items = payload['items'] if 'items' in payload else [payload]
+            futures = [self.server.coalescer.submit(kind, item) for item in items]
+            results = [f.result() for f in futures]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json({'error': str(e)}, 400)
+            return
+        except Exception as e:
+            self._send_json({'error': str(e)}, 500)
+            return
+        binary = ('application/octet-stream' in self.headers.get('Accept', '')
+                  or parse_qs(url.query).get('format') == ['npy'])
+        if kind == 'pulse' and binary and len({len(r['samples']) for r in results}) != 1:
+            self._send_json({'error': 'Binary output needs equal-length pulses'}, 400)
+            return
+        self.server.stats.record_request(url.path, time.perf_counter() - t0, len(items))
+        if kind == 'pulse' and binary:
+            self._send_npy(np.stack([r['samples'] for r in results]))
+        else:
+            if kind == 'pulse':
+                results = [{'samples': r['samples'].tolist()} for r in results]
+            self._send_json({'results': results})
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SEC, quiet=True):
+    """Create (not start) the service. port=0 picks a free port: see server.server_address."""
+    server = ThreadingHTTPServer((host, port), PulseRequestHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    server.stats = ServiceStats()
+    server.coalescer = BatchCoalescer(max_batch=max_batch, max_wait=max_wait, stats=server.stats)
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Local pulse compute service')
+    ap.add_argument('--host', default=DEFAULT_HOST)
+    ap.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = ap.parse_args()
+    server = make_server(args.host, args.port, quiet=False)
+    print(f"Pulse service on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
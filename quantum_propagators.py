@@ -0,0 +1,72 @@
+"""
+Piecewise-constant single-qubit propagators for pulse envelopes.
+Each sample is one time slice of H = (Omega_x X + Omega_y Y + Delta Z) / 2 (rad/s, rotating frame).
+Slices are exponentiated in closed form and chained by pairwise (log-depth) matrix products.
+"""
+import numpy as np
+
+from pulse_comparison import dt_sec
+
+IDENTITY = np.eye(2, dtype=complex)
+PAULI_X = np.array([[0, 1], [1, 0]], dtype=complex)
+PAULI_Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+PAULI_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+
+
+def mhz_to_rad_s(f_mhz):
+    return 2 * np.pi * np.asarray(f_mhz, dtype=float) * 1e6
+
+
+def rotation_rates(samples, angle, dt=dt_sec):
+    """Scale an envelope (rad/s) so its area dt * sum(Omega) equals angle."""
+    samples = np.asarray(samples, dtype=float)
+    area = np.sum(samples, axis=-1, keepdims=True) * dt
+    return np.divide(angle * samples, area, out=np.zeros_like(samples), where=area != 0)
+
+
+def slice_propagators(omega_x, omega_y=0.0, detuning=0.0, dt=dt_sec):
+    """exp(-i dt/2 (Ox X + Oy Y + D Z)) for every slice. Inputs broadcast; returns (..., 2, 2)."""
+    hx, hy, hz = np.broadcast_arrays(*(np.asarray(v, dtype=float) * dt / 2 for v in (omega_x, omega_y, detuning)))
+    theta = np.sqrt(hx**2 + hy**2 + hz**2)
+    c = np.cos(theta)
+    sinc = np.where(theta > 0, np.sin(theta) / np.where(theta > 0, theta, 1), 1.0)
+    u = np.empty(theta.shape + (2, 2), dtype=complex)
+    u[..., 0, 0] = c - 1j * sinc * hz
+    u[..., 1, 1] = c + 1j * sinc * hz
+    u[..., 0, 1] = -1j * sinc * hx - sinc * hy
+    u[..., 1, 0] = -1j * sinc * hx + sinc * hy
+    return u
+
+
+def chain_product(u):
+    """Time-ordered product U[n-1] ... U[0] over axis -3 of (..., n, d, d), by pairwise reduction."""
+    u = np.asarray(u)
+    while u.shape[-3] > 1:
+        if u.shape[-3] % 2:
+            last = u[..., -1:, :, :]
+            u = np.concatenate([u[..., 1::2, :, :] @ u[..., 0:-1:2, :, :], last], axis=-3)
+        else:
+            u = u[..., 1::2, :, :] @ u[..., 0::2, :, :]
+    return u[..., 0, :, :]
+
+
+def pulse_unitary(samples, angle, phase=0.0, detuning=0.0, amplitude_error=0.0, dt=dt_sec):
+    """
+    Propagator of an envelope calibrated to rotate by angle about cos(phase) X + sin(phase) Y.
+    detuning in rad/s; amplitude_error is a relative over/under-drive. Batched over leading dims.
+    """
+    omega = rotation_rates(samples, angle, dt) * (1 + amplitude_error)
+    phase = np.asarray(phase, dtype=float)[..., None]
+    return chain_product(slice_propagators(omega * np.cos(phase), omega * np.sin(phase), detuning, dt))
+
+
+def rz(theta):
+    """Ideal (virtual) Z rotation exp(-i theta Z / 2)."""
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+def gate_fidelity(u, v):
+    """Average gate fidelity between 2x2 unitaries (batched): (|Tr(U^dag V)|^2 + d) / (d(d+1))."""
+    d = u.shape[-1]
+    tr = np.trace(np.conj(np.swapaxes(u, -1, -2)) @ v, axis1=-2, axis2=-1)
+    return (np.abs(tr)**2 + d) / (d * (d + 1))
@@ -0,0 +1,154 @@
+"""
+Shared, disk-backed result cache (SQLite) for the Streamlit app.
+Entries are keyed by a content hash of (kind, parameters, code version), survive restarts,
+are shared by every session and process on the machine, and are evicted LRU above a size cap.
+Warm it with: python warmup.py   (calibration tables and the default gate-length sweep)
+"""
+import os
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.environ.get('QUANTUM_FI_CACHE', os.path.join(SCRIPT_DIR, '.cache', 'results.sqlite'))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Source files whose contents define the cached results; editing any of them changes every key.
+# Kinds computed by other modules add their own files via get_or_compute(..., code_files).
+CODE_FILES = ['pulse_comparison.py', 'pulse_distortion.py', 'result_cache.py']
+
+DEFAULT_PARAMS = {'duration': 160, 't_min': -6.0, 't_max': 5.0, 'sigma_divisor': 5, 'drag_beta': 0.1,
+                  'line_cutoff_ghz': None}
+
+_code_versions = {}
+
+
+def code_version(files=None):
+    """Hash of the given source files (default CODE_FILES), computed once per process."""
+    files = tuple(files or CODE_FILES)
+    if files not in _code_versions:
+        h = hashlib.sha256()
+        for name in files:
+            try:
+                with open(os.path.join(SCRIPT_DIR, name), 'rb') as f:
+                    h.update(f.read())
+            except OSError:
+                h.update(name.encode())
+        _code_versions[files] = h.hexdigest()[:16]
+    return _code_versions[files]
+
+
+def _canonical(value):
+    """JSON-friendly form of parameter values (numpy scalars, tuples, sets)."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def make_key(kind, params, code_files=None):
+    """Content hash of the result kind, its parameters and the code version of code_files (default CODE_FILES)."""
+    payload = json.dumps([kind, _canonical(params), code_version(code_files)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Process-safe SQLite key/value store with LRU eviction above max_bytes."""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, kind TEXT, value BLOB, size INTEGER, last_access REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key, default=None):
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key, value, kind=''):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, kind, value, size, last_access) VALUES (?, ?, ?, ?, ?)',
+                (key, kind, blob, len(blob), time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the total size fits max_bytes."""
+        conn.execute(
+            'DELETE FROM entries WHERE key IN ('
+            ' SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running'
+            ' FROM entries) WHERE running > ?)',
+            (self.max_bytes,),
+        )
+
+    def __contains__(self, key):
+        with self._connect() as conn:
+            return conn.execute('SELECT 1 FROM entries WHERE key = ?', (key,)).fetchone() is not None
+
+    def get_or_compute(self, kind, params, compute, code_files=None):
+        """
+        Return the cached result for (kind, params), computing and storing it on a miss. code_files lists
+        the sources the result depends on (default CODE_FILES); editing one of them invalidates the entry.
+        """
+        key = make_key(kind, params, code_files)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, kind)
+        return value
+
+    def stats(self):
+        with self._connect() as conn:
+            n, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        total = self.hits + self.misses
+        return {'entries': n, 'bytes': size, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0}
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries')
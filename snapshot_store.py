@@ -0,0 +1,186 @@
+"""
+Golden snapshots of every pulse family over a grid of durations and shape parameters, for regression checks.
+Per configuration the store keeps a 64-bit hash of the samples quantized to 2^-QUANT_BITS and a short
+quantized summary (energy, peak, moments, probe samples) instead of the arrays. Verification regenerates
+the pulses in batches of one duration and compares hashes. Where a hash differs, samples lying within
+BOUNDARY_LSB of a rounding boundary are tried on both sides of it: if one combination reproduces the
+recorded hash, the change is last-bit float noise (reported as drift); otherwise it is a failure, listed
+with the summary fields that moved.
+Run: python snapshot_store.py [--update]   (verify golden_snapshots.npz, or re-record it)
+"""
+import sys
+import json
+import time
+import hashlib
+import itertools
+
+import numpy as np
+
+from pulse_comparison import PULSE_NAMES, create_pulse
+from waveform_fit import FIT_BOUNDS
+
+SNAPSHOT_FILE = 'golden_snapshots.npz'
+SNAPSHOT_DURATIONS = tuple(range(10, 501, 10)) + (7, 33, 161, 1000)
+PARAM_POINTS = 5  # grid points per shape parameter between its FIT_BOUNDS
+QUANT_BITS = 32  # sample resolution hashed: 2^-32 of full scale
+SUMMARY_SCALE = 1e6  # summary quantum: 1e-6
+BOUNDARY_LSB = 1e-3  # samples this close (in LSB) to a rounding boundary may round either way
+MAX_FLIPS = 12  # at most 2^12 rounding combinations tried per changed array
+PROBES = 8  # samples at evenly spaced positions
+SUMMARY_FIELDS = ['energy', 'peak', 'mean', 'centroid', 'first', 'last'] + [f'probe{i}' for i in range(PROBES)]
+
+
+def snapshot_configs(durations=SNAPSHOT_DURATIONS, points=PARAM_POINTS):
+    """(family, duration, params) for every family, duration and point of the parameter grid."""
+    configs = []
+    for duration in durations:
+        for family in PULSE_NAMES:
+            bounds = FIT_BOUNDS.get(family, {})
+            names = sorted(bounds)
+            axes = [np.round(np.linspace(*bounds[n], points), 6) for n in names]
+            for values in itertools.product(*axes):
+                configs.append((family, int(duration), {n: float(v) for n, v in zip(names, values)}))
+    return configs
+
+
+def quantize(samples):
+    """Samples on the 2^-QUANT_BITS grid as int64."""
+    return np.round(np.asarray(samples, dtype=float) * 2.0**QUANT_BITS).astype(np.int64)
+
+
+def _hash(q):
+    return int.from_bytes(hashlib.blake2b(np.ascontiguousarray(q, dtype='<i8').tobytes(), digest_size=8).digest(),
+                          'little')
+
+
+def array_hashes(samples):
+    """64-bit BLAKE2b of each quantized row of a (k, n) stack, as uint64 (k,)."""
+    return np.array([_hash(row) for row in quantize(samples)], dtype=np.uint64)
+
+
+def within_rounding(samples, golden_hash):
+    """
+    True if samples quantize to golden_hash once samples within BOUNDARY_LSB of a rounding boundary may
+    round either way, i.e. they differ from the recorded quantization only by such +-1 LSB flips.
+    """
+    scaled = np.asarray(samples, dtype=float) * 2.0**QUANT_BITS
+    q = np.round(scaled).astype(np.int64)
+    floor = np.floor(scaled).astype(np.int64)
+    near = np.flatnonzero(np.abs(scaled - floor - 0.5) < BOUNDARY_LSB)
+    if len(near) > MAX_FLIPS:
+        return False
+    other = 2 * floor[near] + 1 - q[near]  # the neighbor on the far side of the boundary
+    for flips in itertools.product((False, True), repeat=len(near)):
+        trial = q.copy()
+        trial[near] = np.where(flips, other, q[near])
+        if _hash(trial) == int(golden_hash):
+            return True
+    return False
+
+
+def summarize(samples):
+    """SUMMARY_FIELDS of each row of a (k, n) stack, quantized to 1/SUMMARY_SCALE as int64 (k, fields)."""
+    s = np.atleast_2d(np.asarray(samples, dtype=float))
+    n = s.shape[-1]
+    mag2 = s**2
+    energy = mag2.sum(axis=-1)
+    centroid = np.divide(mag2 @ np.arange(n), energy, out=np.zeros_like(energy), where=energy > 0) / max(n - 1, 1)
+    probes = s[:, np.linspace(0, n - 1, PROBES).round().astype(int)]
+    cols = np.column_stack([energy, np.abs(s).max(axis=-1), s.mean(axis=-1), centroid, s[:, 0], s[:, -1], probes])
+    return np.round(cols * SUMMARY_SCALE).astype(np.int64)
+
+
+def _batches(configs):
+    """Indices of configs grouped by duration (one stacked batch each)."""
+    groups = {}
+    for i, (_, duration, _) in enumerate(configs):
+        groups.setdefault(duration, []).append(i)
+    return groups.values()
+
+
+def fingerprint(configs, with_summary=True):
+    """(hashes (k,), summary (k, fields) or None) of freshly generated pulses for configs."""
+    hashes = np.empty(len(configs), dtype=np.uint64)
+    summary = np.empty((len(configs), len(SUMMARY_FIELDS)), dtype=np.int64) if with_summary else None
+    for rows in _batches(configs):
+        stack = np.stack([create_pulse(configs[i][0], configs[i][1], **configs[i][2]) for i in rows])
+        hashes[rows] = array_hashes(stack)
+        if with_summary:
+            summary[rows] = summarize(stack)
+    return hashes, summary
+
+
+class GoldenSnapshots:
+    """Recorded configurations with their sample hashes and quantized summaries."""
+
+    def __init__(self, configs, hashes, summary):
+        self.configs = configs
+        self.hashes = hashes
+        self.summary = summary
+
+    def __len__(self):
+        return len(self.configs)
+
+    @classmethod
+    def record(cls, configs=None):
+        configs = snapshot_configs() if configs is None else list(configs)
+        return cls(configs, *fingerprint(configs))
+
+    def verify(self):
+        """
+        Regenerate every configuration and compare. Returns {'checked', 'drift', 'failures'}, where failures
+        are {'family', 'duration', 'params', 'diff': {field: (golden, current)}} with the summary fields that
+        moved (empty if the change is below the summary resolution), and drift counts rounding-only changes.
+        """
+        hashes, _ = fingerprint(self.configs, with_summary=False)
+        failures, drift = [], 0
+        for i in np.flatnonzero(hashes != self.hashes):
+            family, duration, params = self.configs[i]
+            samples = create_pulse(family, duration, **params)
+            if within_rounding(samples, self.hashes[i]):
+                drift += 1
+                continue
+            old, new = self.summary[i], summarize(samples)[0]
+            diff = {f: (float(o) / SUMMARY_SCALE, float(v) / SUMMARY_SCALE)
+                    for f, o, v in zip(SUMMARY_FIELDS, old, new) if o != v}
+            failures.append({'family': family, 'duration': duration, 'params': params, 'diff': diff})
+        return {'checked': len(self.configs), 'drift': drift, 'failures': failures}
+
+    def save(self, path=SNAPSHOT_FILE):
+        np.savez_compressed(path, family=np.array([c[0] for c in self.configs], dtype=str),
+                            duration=np.array([c[1] for c in self.configs], dtype=np.int32),
+                            params=np.array([json.dumps(c[2], sort_keys=True) for c in self.configs], dtype=str),
+                            hashes=self.hashes, summary=self.summary, fields=np.array(SUMMARY_FIELDS, dtype=str),
+                            quant_bits=np.array(QUANT_BITS), summary_scale=np.array(SUMMARY_SCALE))
+        return path
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_FILE):
+        with np.load(path) as z:
+            if list(z['fields']) != SUMMARY_FIELDS or int(z['quant_bits']) != QUANT_BITS \
+                    or float(z['summary_scale']) != SUMMARY_SCALE:
+                raise ValueError(f"{path} was recorded with a different snapshot format; re-record with --update")
+            configs = [(str(f), int(d), json.loads(str(p))) for f, d, p in zip(z['family'], z['duration'], z['params'])]
+            return cls(configs, z['hashes'], z['summary'])
+
+
+def format_failure(failure):
+    params = ', '.join(f'{k}={v}' for k, v in failure['params'].items())
+    fields = '; '.join(f'{f} {old:.6f} -> {new:.6f}' for f, (old, new) in failure['diff'].items()) \
+        or f'samples changed below the summary resolution ({1 / SUMMARY_SCALE:g})'
+    return f"{failure['family']} duration={failure['duration']}{' ' + params if params else ''}: {fields}"
+
+
+if __name__ == "__main__":
+    t0 = time.time()
+    if '--update' in sys.argv[1:]:
+        snapshots = GoldenSnapshots.record()
+        snapshots.save()
+        print(f"Recorded {len(snapshots)} configurations to {SNAPSHOT_FILE} in {time.time() - t0:.2f} s")
+        sys.exit(0)
+    result = GoldenSnapshots.load().verify()
+    for failure in result['failures']:
+        print(f"CHANGED: {format_failure(failure)}")
+    print(f"{result['checked']} configurations checked, {len(result['failures'])} changed, "
+          f"{result['drift']} rounding drift ({time.time() - t0:.2f} s)")
+    sys.exit(len(result['failures']) > 0)
@@ -0,0 +1,44 @@
+"""
+Smoke tests of the Streamlit app, run headless with streamlit.testing.
+Run with: python test_app.py
+"""
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+from pulse_comparison import PULSE_NAMES
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def _checkbox(at, label):
+    return next(c for c in at.sidebar.checkbox if c.label == label)
+
+
+def test_ibm_mode_with_no_visible_family():
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    assert not at.exception
+    _checkbox(at, 'IBM mode').check()
+    for name in PULSE_NAMES:
+        _checkbox(at, name).uncheck()
+    at.run()
+    assert not at.exception, at.exception
+    assert any('No pulse family is visible' in c.value for c in at.caption)
+    _checkbox(at, 'DRAG').check()
+    at.run()
+    assert not at.exception and len(at.tabs) >= 3
+
+
+if __name__ == "__main__":
+    tests = [test_ibm_mode_with_no_visible_family]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
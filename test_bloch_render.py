@@ -0,0 +1,63 @@
+"""
+Unit tests for templated Bloch-sphere rendering.
+Run with: python test_bloch_render.py
+"""
+import sys
+import numpy as np
+
+from pulse_comparison import create_phi_pulse, create_gaussian_pulse
+from bloch_trajectory import simulate_trajectories, states_to_bloch_vectors
+from bloch_render import render_bloch_png, render_bloch_grid_png, render_bloch_pngs, trajectory_hash, get_template
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _vectors(resolution=50):
+    traj = simulate_trajectories({'Phi': create_phi_pulse(160), 'Gaussian': create_gaussian_pulse(160)},
+                                 np.pi / 2, resolution)
+    return {name: states_to_bloch_vectors(states) for name, (states, _) in traj.items()}
+
+
+def test_render_reuses_template():
+    v = _vectors()
+    a = render_bloch_png(v['Phi'], 'Phi')
+    b = render_bloch_png(v['Gaussian'], 'Gaussian')
+    assert a.startswith(PNG_SIGNATURE) and b.startswith(PNG_SIGNATURE)
+    assert a != b
+    # Same input on the reused template gives the same image (nothing left over from the previous render)
+    assert render_bloch_png(v['Phi'], 'Phi') == a
+    assert get_template(1) is get_template(1)
+
+
+def test_hash_cache_skips_unchanged():
+    v = _vectors()
+    cache = {}
+    first = render_bloch_pngs(v, cache=cache)
+    assert set(first) == {'Phi', 'Gaussian'} and len(cache) == 2
+    v2 = dict(v, Gaussian=_vectors(100)['Gaussian'])
+    assert trajectory_hash(v2['Phi'], 'Phi') == trajectory_hash(v['Phi'], 'Phi')
+    assert trajectory_hash(v2['Gaussian'], 'Gaussian') != trajectory_hash(v['Gaussian'], 'Gaussian')
+    second = render_bloch_pngs(v2, cache=cache)
+    assert len(cache) == 3
+    assert second['Phi'] is first['Phi']
+
+
+def test_grid_figure():
+    png = render_bloch_grid_png(_vectors())
+    assert png.startswith(PNG_SIGNATURE)
+    width, height = np.frombuffer(png[16:24], dtype='>u4')
+    assert width == 2 * height
+
+
+if __name__ == "__main__":
+    tests = [test_render_reuses_template, test_hash_cache_skips_unchanged, test_grid_figure]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,54 @@
+"""
+Unit tests for vectorized Bloch trajectories.
+Run with: python test_bloch_trajectory.py
+"""
+import sys
+import numpy as np
+
+from pulse_comparison import create_phi_pulse, create_gaussian_pulse, create_square_pulse
+from bloch_trajectory import (
+    cumulative_angles,
+    rotation_states,
+    states_to_bloch_vectors,
+    simulate_trajectories,
+)
+
+
+def _reference_states(p, target_angle, num_steps):
+    """Original per-step loop from app.py."""
+    energy = np.sum(np.abs(p)**2)
+    states = [np.array([1, 0], dtype=complex)]
+    for i in np.linspace(0, len(p) - 1, num_steps, dtype=int):
+        a = target_angle * np.sum(np.abs(p[:i+1])**2) / energy
+        states.append(np.array([np.cos(a/2), -1j * np.sin(a/2)]))
+    return np.array(states)
+
+
+def test_matches_loop_at_50_steps():
+    p = create_phi_pulse(160)
+    angles, eff = cumulative_angles(p, np.pi/2, 50)
+    assert np.allclose(rotation_states(angles), _reference_states(p, np.pi/2, 50))
+    assert np.isclose(eff, np.pi/2 * (np.sum(p**2) / 160) / 0.5)
+
+
+def test_full_resolution_batch():
+    pulses = {'g': create_gaussian_pulse(120), 's': create_square_pulse(120), 'p': create_phi_pulse(80)}
+    traj = simulate_trajectories(pulses, np.pi, resolution=None)
+    assert list(traj) == ['g', 's', 'p']
+    assert traj['g'][0].shape == (121, 2) and traj['p'][0].shape == (81, 2)
+    z = states_to_bloch_vectors(traj['s'][0])[:, 2]
+    assert np.isclose(z[-1], -1.0)
+
+
+if __name__ == "__main__":
+    tests = [test_matches_loop_at_50_steps, test_full_resolution_batch]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,60 @@
+"""
+Unit tests for on-demand table and sweep exports.
+Run with: python test_data_export.py
+"""
+import io
+import sys
+import zipfile
+import numpy as np
+import pandas as pd
+
+from data_export import available_formats, table_bytes, pulse_table, write_sweep_archive, iter_sweep_archive
+from pulse_comparison import build_pulses
+
+
+def _table():
+    return pulse_table(build_pulses())
+
+
+def test_formats_round_trip():
+    table = _table()
+    assert np.allclose(pd.read_csv(io.BytesIO(table_bytes(table, 'csv')))['Gaussian'], table['Gaussian'])
+    npz = np.load(io.BytesIO(table_bytes(table, 'npz')))
+    assert np.array_equal(npz['Phi_(Golden_Ratio)'], table['Phi_(Golden_Ratio)'])
+    if 'parquet' in available_formats():
+        df = pd.read_parquet(io.BytesIO(table_bytes(table, 'parquet')))
+        assert np.array_equal(df['DRAG'].to_numpy(), table['DRAG'])
+
+
+def test_text_columns_load_without_pickle():
+    df = pd.DataFrame({'Pulse': ['Phi', 'DRAG'], 'Energy': [1.5, 2.0]})
+    npz = np.load(io.BytesIO(table_bytes(df, 'npz')))
+    assert list(npz['Pulse']) == ['Phi', 'DRAG']
+
+
+def test_sweep_archive_streams_entries():
+    durations = [20, 40, 60]
+    chunks = list(iter_sweep_archive(durations, 'npz', drag_beta=0.3))
+    assert len(chunks) == len(durations) + 1 and all(chunks[:-1])
+    streamed = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+    buf = io.BytesIO()
+    assert write_sweep_archive(buf, durations, 'npz', drag_beta=0.3) == 3
+    written = zipfile.ZipFile(buf)
+    assert streamed.namelist() == written.namelist() == ['pulses_0020.npz', 'pulses_0040.npz', 'pulses_0060.npz']
+    drag = np.load(io.BytesIO(streamed.read('pulses_0040.npz')))['DRAG']
+    ref = build_pulses(duration=40, drag_beta=0.3)['DRAG']
+    assert np.array_equal(drag, ref)
+
+
+if __name__ == "__main__":
+    tests = [test_formats_round_trip, test_text_columns_load_without_pickle, test_sweep_archive_streams_entries]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
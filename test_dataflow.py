@@ -0,0 +1,71 @@
+"""
+Unit tests for the incremental dataflow graph.
+Run with: python test_dataflow.py
+"""
+import sys
+import numpy as np
+
+from dataflow import Dataflow, pulse_graph
+from pulse_comparison import PULSE_NAMES, build_pulses, compute_leakage_metrics, dt_sec
+from pulse_distortion import awg_lowpass, distort_pulses
+from result_cache import DEFAULT_PARAMS
+
+
+def test_only_dirty_nodes_run():
+    g = Dataflow()
+    g.add('double', lambda a: 2 * a, ['a'])
+    g.add('sum', lambda d, b: d + b, ['double', 'b'])
+    g.set_params(a=1, b=10)
+    assert g.get('sum') == 12 and g.executed == ['double', 'sum']
+    g.set_params(a=1, b=10)
+    assert g.get('sum') == 12 and g.executed == []
+    g.set_params(b=20)
+    assert g.get('sum') == 22 and g.executed == ['sum']
+
+
+def test_unchanged_value_stops_invalidation():
+    g = Dataflow()
+    g.add('sign', np.sign, ['x'])
+    g.add('label', lambda s: {1: 'pos', -1: 'neg'}[int(s)], ['sign'])
+    g.set_params(x=3.0)
+    g.get('label')
+    g.set_params(x=5.0)
+    assert g.get('label') == 'pos' and g.executed == ['sign']
+
+
+def test_pulse_graph_matches_direct_computation():
+    g = pulse_graph()
+    for params in (DEFAULT_PARAMS, dict(DEFAULT_PARAMS, duration=90, drag_beta=0.3, line_cutoff_ghz=0.2)):
+        g.set_params(**params)
+        shape = {k: v for k, v in params.items() if k != 'line_cutoff_ghz'}
+        ref = build_pulses(**shape)
+        if params['line_cutoff_ghz']:
+            ref = distort_pulses(ref, awg_lowpass(params['line_cutoff_ghz']))
+        for name in PULSE_NAMES:
+            assert np.allclose(g.get(f'pulse:{name}'), ref[name])
+            assert np.isclose(g.get(f'energy:{name}'), np.sum(np.abs(ref[name])**2))
+            assert np.allclose(g.get(f'leakage:{name}'), compute_leakage_metrics(ref[name], dt_sec))
+
+
+def test_drag_beta_touches_only_drag():
+    g = pulse_graph()
+    g.set_params(**DEFAULT_PARAMS)
+    g.get_many('leakage', PULSE_NAMES)
+    g.set_params(**dict(DEFAULT_PARAMS, drag_beta=0.25))
+    g.get_many('leakage', PULSE_NAMES)
+    assert sorted(g.executed) == ['leakage:DRAG', 'pulse:DRAG', 'raw:DRAG']
+
+
+if __name__ == "__main__":
+    tests = [test_only_dirty_nodes_run, test_unchanged_value_stops_invalidation,
+             test_pulse_graph_matches_direct_computation, test_drag_beta_touches_only_drag]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the batched gate-length sweep behind the IBM mode curves.
+Run with: python test_gate_length_sweep.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+from gate_length_sweep import sweep_durations, alignment_scores, gate_length_sweep, cached_sweep, best_durations
+from pulse_comparison import build_pulses, compute_leakage_metrics, PULSE_NAMES
+from pulse_distortion import awg_lowpass, distort_pulses
+from result_cache import ResultCache
+
+
+def _row_score(e, lk, drag_energy, in_range):
+    """The app's original per-row alignment score."""
+    if drag_energy and drag_energy > 0:
+        energy_penalty = min(50, max(0, 50 * (e / drag_energy - 1)))
+        leakage_penalty = min(40, lk * 10)
+        return max(0, min(100, 100 - energy_penalty - leakage_penalty + (10 if in_range else 0)))
+    return 50
+
+
+def test_vectorized_score_matches_row_formula():
+    rng = np.random.default_rng(0)
+    e, lk, drag = rng.uniform(0, 40, 200), rng.uniform(0, 6, 200), rng.uniform(0, 30, 200)
+    drag[:5] = 0
+    ok = rng.random(200) > 0.5
+    expected = [_row_score(*args) for args in zip(e, lk, drag, ok)]
+    assert np.allclose(alignment_scores(e, lk, drag, ok), expected)
+
+
+def test_sweep_matches_per_duration_app_metrics():
+    durations = sweep_durations(10, 50)
+    assert durations[0] == 10 and durations[-1] == 50 and len(durations) == 41
+    assert len(sweep_durations(10, 500)) <= 101 and sweep_durations(10, 500)[-1] == 500
+    records = gate_length_sweep([17, 40, 120], sigma_divisor=4, drag_beta=0.3, line_cutoff_ghz=0.3)
+    assert len(records) == 3 * len(PULSE_NAMES)
+    for d in (17, 40, 120):
+        pulses = distort_pulses(build_pulses(d, -6, 5, 4, 0.3), awg_lowpass(0.3))
+        energies = {n: np.sum(s**2) for n, s in pulses.items()}
+        for r in (r for r in records if r['duration'] == d):
+            lk, bw = compute_leakage_metrics(pulses[r['family']])
+            assert np.isclose(r['energy'], energies[r['family']])
+            assert np.isclose(r['leakage_pct'], lk) and np.isclose(r['bandwidth_ghz'], bw)
+            assert np.isclose(r['alignment'], _row_score(r['energy'], lk, energies['DRAG'], d <= 50))
+            assert r['in_range'] == (d <= 50)
+
+
+def test_cached_and_best_durations():
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResultCache(os.path.join(d, 'c.sqlite'))
+        a = cached_sweep(cache, (10, 30), drag_beta=0.2)
+        b = cached_sweep(cache, (10, 30), drag_beta=0.2, duration=999)  # duration is not a sweep parameter
+        assert a == b and cache.hits == 1 and cache.misses == 1
+    best = best_durations([
+        {'family': 'Sinc', 'duration': 30, 'alignment': 90.0, 'energy': 5.0},
+        {'family': 'Sinc', 'duration': 20, 'alignment': 90.0, 'energy': 5.0},
+        {'family': 'Sinc', 'duration': 40, 'alignment': 90.0, 'energy': 4.0},
+        {'family': 'Gaussian', 'duration': 10, 'alignment': 80.0, 'energy': 1.0},
+        {'family': 'Gaussian', 'duration': 50, 'alignment': 95.0, 'energy': 9.0},
+    ])
+    assert [(r['family'], r['duration']) for r in best] == [('Gaussian', 50), ('Sinc', 40)]
+
+
+if __name__ == "__main__":
+    tests = [test_vectorized_score_matches_row_formula, test_sweep_matches_per_duration_app_metrics,
+             test_cached_and_best_durations]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,85 @@
+"""
+Unit tests for out-of-core library analytics and the summary index.
+Run with: python test_library_analytics.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+from library_analytics import open_array, library_entries, build_index, LibraryIndex
+from export_qiskit_waveform import export_waveform_library
+from pulse_comparison import PULSE_FAMILIES, create_pulse, compute_leakage_metrics
+
+
+def _library(d, count=140):
+    waveforms = {f'{f}_{i}': (0.3 + 0.005 * i) * create_pulse(f, (40, 80, 160)[i % 3])
+                 for i, f in enumerate(list(PULSE_FAMILIES) * (count // len(PULSE_FAMILIES)))}
+    path = os.path.join(d, 'lib.npz')
+    export_waveform_library([waveforms], path=path)
+    return path, waveforms
+
+
+def test_arrays_are_mapped_not_loaded():
+    with tempfile.TemporaryDirectory() as d:
+        plain, packed = os.path.join(d, 'plain.npz'), os.path.join(d, 'packed.npz')
+        x = np.arange(1000.0)
+        np.savez(plain, x=x)
+        np.savez_compressed(packed, x=x)
+        m = open_array(plain, 'x')
+        assert isinstance(m, np.memmap) and np.array_equal(m[10:20], x[10:20])
+        assert np.array_equal(open_array(packed, 'x')[990:1000], x[990:])
+        del m
+
+
+def test_index_matches_in_memory_metrics():
+    with tempfile.TemporaryDirectory() as d:
+        path, waveforms = _library(d)
+        extra = os.path.join(d, 'phi_pulses.npz')
+        np.savez_compressed(extra, phi=create_pulse('phi', 160), duration=160, dt=1e-9)
+        assert [e[0] for e in library_entries(extra)] == ['phi']
+        index = build_index([path, extra], os.path.join(d, 'index.npz'), workers=2, block_samples=3000)
+        assert len(index) == len(waveforms) + 1
+        for _, row in index.table.sample(20, random_state=0).iterrows():
+            s = waveforms.get(row['name'], create_pulse('phi', 160))
+            leak, bw = compute_leakage_metrics(s)
+            assert np.isclose(row['energy'], np.sum(s**2), rtol=1e-6) and row['length'] == len(s)
+            assert np.isclose(row['leakage_pct'], leak, rtol=1e-4, atol=1e-9) and np.isclose(row['bandwidth_ghz'], bw)
+
+
+def test_queries_and_incremental_rebuild():
+    with tempfile.TemporaryDirectory() as d:
+        path, waveforms = _library(d)
+        index_path = os.path.join(d, 'index.npz')
+        build_index([path], index_path, workers=1)
+        index = LibraryIndex.load(index_path)
+        hits = index.query(leakage_pct_max=0.01, energy_max=20)
+        expected = {n for n, s in waveforms.items() if compute_leakage_metrics(s)[0] <= 0.01 and np.sum(s**2) <= 20}
+        assert set(hits['name']) == expected and 0 < len(expected) < len(waveforms)
+        try:
+            index.query(leakage_max=1)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown metric accepted")
+        # Unchanged file: rows come from the old index (mark them to prove no re-analysis happened)
+        index.table['peak'] = -1.0
+        index.save(index_path)
+        assert np.all(build_index([path], index_path).table['peak'] == -1.0)
+        os.utime(path, ns=(0, 0))
+        assert np.all(build_index([path], index_path).table['peak'] > 0)
+
+
+if __name__ == "__main__":
+    tests = [test_arrays_are_mapped_not_loaded, test_index_matches_in_memory_metrics,
+             test_queries_and_incremental_rebuild]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
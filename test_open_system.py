@@ -0,0 +1,71 @@
+"""
+Unit tests for the Lindblad (T1/T2) simulator.
+Run with: python test_open_system.py
+"""
+import sys
+import numpy as np
+
+from open_system import LindbladSimulator, unitary_superoperator, rank_families
+from quantum_propagators import pulse_unitary, mhz_to_rad_s
+from pulse_comparison import PULSE_FAMILIES, create_pulse
+
+
+def test_no_decoherence_matches_unitary():
+    stack = np.stack([create_pulse(f, 160) for f in PULSE_FAMILIES])
+    sim = LindbladSimulator(np.inf, np.inf, detuning_mhz=0.3, amplitude_error=0.01)
+    u = pulse_unitary(stack, np.pi / 2, 0.0, mhz_to_rad_s(0.3), 0.01)
+    assert np.allclose(sim.channel(stack), unitary_superoperator(u), atol=1e-10)
+    m = sim.metrics(stack)
+    assert np.allclose(m['fidelity'], m['unitary_fidelity'], atol=1e-12)
+    assert np.allclose(m['purity'], 1.0)
+
+
+def test_idle_decay_matches_t1_t2():
+    t1, t2, t = 20.0, 30.0, 200
+    sim = LindbladSimulator(t1, t2)
+    idle = np.zeros(t)
+    rho = sim.evolve(idle, 0.0, np.array([[0, 0], [0, 1]]))
+    assert np.isclose(rho[1, 1].real, np.exp(-t / (t1 * 1e3)))
+    rho = sim.evolve(idle, 0.0, np.full((2, 2), 0.5))
+    assert np.isclose(abs(rho[0, 1]), 0.5 * np.exp(-t / (t2 * 1e3)))
+    expected = (3 + np.exp(-t / (t1 * 1e3)) + 2 * np.exp(-t / (t2 * 1e3))) / 6
+    assert np.isclose(sim.metrics(idle, 0.0)['fidelity'], expected)
+
+
+def test_repeated_slices_exponentiated_once():
+    sim = LindbladSimulator()
+    sim.channel(create_pulse('square', 500))
+    assert sim.cache_size == 1
+    sim.channel(create_pulse('gaussian square', 400))
+    n = sim.cache_size
+    assert n < 400
+    sim.channel(create_pulse('gaussian square', 400))
+    assert sim.cache_size == n
+
+
+def test_decoherence_penalizes_long_pulses():
+    rows = rank_families(durations=(20, 320), t1_us=10, t2_us=10)
+    assert len(rows) == 2 * len(PULSE_FAMILIES)
+    assert all(r['duration'] == 20 for r in rows[:len(PULSE_FAMILIES)])
+    assert all(r['fidelity'] < r['unitary_fidelity'] for r in rows)
+    try:
+        LindbladSimulator(t1_us=10, t2_us=30)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("T2 > 2 T1 accepted")
+
+
+if __name__ == "__main__":
+    tests = [test_no_decoherence_matches_unitary, test_idle_decay_matches_t1_t2,
+             test_repeated_slices_exponentiated_once, test_decoherence_penalizes_long_pulses]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,45 @@
+"""
+Unit tests for the Pareto-front search.
+Run with: python test_pareto_search.py
+"""
+import sys
+import numpy as np
+
+from pareto_search import nondominated, search_family, search_all, front_records
+from pulse_comparison import create_drag_pulse, compute_leakage_metrics
+
+
+def test_nondominated_matches_brute_force():
+    p = np.random.default_rng(3).random((300, 3))
+    brute = [not any(np.all(q <= x) and np.any(q < x) for q in p) for x in p]
+    assert np.array_equal(nondominated(p), brute)
+
+
+def test_search_family_front_is_consistent():
+    r = search_family('drag', initial_points=4, rounds=2)
+    assert len(r['x']) > 0 and r['evaluated'] >= len(r['x'])
+    assert np.all(nondominated(r['f'][:, :3]))
+    d, beta = int(r['x'][0, 0]), r['x'][0, 1]
+    s = create_drag_pulse(d, beta)
+    assert np.isclose(r['f'][0, 0], np.sum(s**2))
+    assert np.isclose(r['f'][0, 1], compute_leakage_metrics(s)[0])
+
+
+def test_records_cover_families():
+    rows = front_records(search_all(['square', 'gaussian'], workers=1, initial_points=3, rounds=1))
+    assert {r['family'] for r in rows} == {'Square', 'Gaussian'}
+    assert all(10 <= r['duration'] <= 500 for r in rows)
+
+
+if __name__ == "__main__":
+    tests = [test_nondominated_matches_brute_force, test_search_family_front_is_consistent, test_records_cover_families]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
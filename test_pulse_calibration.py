@@ -0,0 +1,92 @@
+"""
+Unit tests for amplitude calibration tables.
+Run with: python test_pulse_calibration.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+from pulse_comparison import create_pulse
+from pulse_calibration import (
+    calibrate_family,
+    excited_population,
+    build_tables,
+    resonant_table,
+    cached_tables,
+    save_tables,
+    load_tables,
+)
+
+DURATIONS = np.arange(20, 201, 20)
+
+
+def _angle_deg(samples, amp, detuning_mhz=0.0):
+    return np.degrees(2 * np.arcsin(np.sqrt(excited_population(samples, amp, detuning_mhz))))
+
+
+def test_resonant_calibration_is_exact_off_grid():
+    t = calibrate_family('gaussian', DURATIONS, param_axes={'sigma_divisor': [3, 5, 8]})
+    amp = t.amplitude(130, 87.3, sigma_divisor=4.2)
+    assert np.isclose(_angle_deg(create_pulse('gaussian', 130, sigma_divisor=4.2), amp), 87.3, atol=1e-6)
+    # pi pulse of a square envelope: Omega * T = pi
+    assert np.isclose(calibrate_family('square', DURATIONS).amplitude(100, 180),
+                      1 / (2 * 50e6 * 100e-9))
+    assert t.amplitude(60, 0) == 0.0
+
+
+def test_detuned_calibration_interpolates():
+    t = calibrate_family('drag', DURATIONS, param_axes={'beta': [0, 0.2, 0.4]}, detuning_mhz=2.0)
+    amp = t.amplitude(70, 120, beta=0.1)
+    assert abs(_angle_deg(create_pulse('drag', 70, beta=0.1), amp, 2.0) - 120) < 0.5
+    amps = t.amplitude(np.array([40, 70, 150]), np.array([[45], [90]]))
+    assert amps.shape == (2, 3) and np.all(np.diff(amps, axis=0) > 0)
+
+
+def test_query_validation():
+    t = calibrate_family('gaussian', DURATIONS, param_axes={})
+    for bad in (lambda: t.amplitude(500, 90), lambda: t.amplitude(100, 90, sigma_divisor=7),
+                lambda: t.amplitude(100, 90, beta=0.1)):
+        try:
+            bad()
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError")
+
+
+def test_resonant_tables_need_no_build():
+    built = calibrate_family('drag', DURATIONS, param_axes={'beta': [0, 0.2, 0.4]})
+    t = resonant_table('drag', DURATIONS, param_axes={'beta': [0, 0.2, 0.4]})
+    assert t.values.size == 8 and t.axes[1][0] == 'beta'
+    assert np.isclose(t.amplitude(130, 87.3, beta=0.13), built.amplitude(130, 87.3, beta=0.13), rtol=1e-6)
+
+    class NoCache:
+        def get_or_compute(self, *args):
+            raise AssertionError("resonant tables must not be built or cached")
+    tables = cached_tables(NoCache())
+    assert np.isclose(tables['Square'].amplitude(100, 180), 1 / (2 * 50e6 * 100e-9))
+
+
+def test_save_load_roundtrip():
+    tables = build_tables(['phi', 'raised_cosine'], workers=1, durations=DURATIONS)
+    with tempfile.TemporaryDirectory() as d:
+        loaded = load_tables(save_tables(tables, os.path.join(d, 'cal.npz')))
+    assert set(loaded) == {'Phi (Golden Ratio)', 'Raised Cosine'}
+    phi = loaded['Phi (Golden Ratio)']
+    assert phi.values.dtype == np.float32 and phi.param_names == ['t_max', 't_min']
+    assert np.isclose(phi.amplitude(90, 60, t_min=-5), tables['Phi (Golden Ratio)'].amplitude(90, 60, t_min=-5))
+
+
+if __name__ == "__main__":
+    tests = [test_resonant_calibration_is_exact_off_grid, test_detuned_calibration_interpolates,
+             test_query_validation, test_resonant_tables_need_no_build, test_save_load_roundtrip]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,65 @@
+"""
+Unit tests for the AWG/line distortion model.
+Run with: python test_pulse_distortion.py
+"""
+import sys
+import numpy as np
+from scipy.signal import lfilter
+
+from pulse_distortion import LineDistortion, awg_lowpass, distort_pulses
+from pulse_comparison import create_gaussian_pulse, create_raised_cosine_pulse, build_pulses
+
+
+def test_overlap_add_matches_direct_filter():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(50_000)
+    taps = rng.standard_normal(129)
+    line = LineDistortion(taps)
+    ref = lfilter(taps, [1.0], x)
+    assert np.allclose(line.apply(x), ref)
+    streamed = np.concatenate(list(line.apply_stream(np.array_split(x, 37))))
+    assert np.allclose(streamed, ref)
+
+
+def test_stream_with_delay_keeps_length_and_alignment():
+    line = LineDistortion.from_response([0.0, 0.5], [1.0, 1.0], n_taps=64)
+    x = create_gaussian_pulse(300)
+    assert np.allclose(line.apply(x), x, atol=1e-9)
+    streamed = np.concatenate(list(line.apply_stream([x[:7], x[7:200], x[200:]])))
+    assert len(streamed) == 300 and np.allclose(streamed, x, atol=1e-9)
+    rng = np.random.default_rng(1)
+    short_line = LineDistortion(rng.normal(size=31), delay=15)
+    for split in ([5], [2, 3], [5, 0]):
+        x = rng.normal(size=sum(split))
+        streamed = np.concatenate(list(short_line.apply_stream(np.split(x, np.cumsum(split)[:-1]))))
+        assert len(streamed) == len(x) and np.allclose(streamed, short_line.apply(x))
+
+
+def test_predistortion_inverts_lowpass():
+    line = awg_lowpass(0.25, order=2)
+    x = np.pad(create_raised_cosine_pulse(160), 64)
+    assert np.max(np.abs(line.apply(x) - x)) > 1e-2
+    y = line.apply(line.predistort(x))
+    assert np.max(np.abs(y - x)) < 2e-3
+
+
+def test_distort_pulses_batches_dict():
+    pulses = build_pulses(80)
+    out = distort_pulses(pulses, awg_lowpass(0.1))
+    assert list(out) == list(pulses)
+    assert np.allclose(out['Sinc'], awg_lowpass(0.1).apply(pulses['Sinc']))
+
+
+if __name__ == "__main__":
+    tests = [test_overlap_add_matches_direct_filter, test_stream_with_delay_keeps_length_and_alignment,
+             test_predistortion_inverts_lowpass, test_distort_pulses_batches_dict]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,79 @@
+"""
+Unit tests for gate-sequence composition.
+Run with: python test_pulse_sequence.py
+"""
+import sys
+import time
+import numpy as np
+
+from pulse_sequence import make_gate, Delay, VirtualZ, SequenceSimulator, render_samples, schedule_duration
+from quantum_propagators import pulse_unitary, rz, gate_fidelity, mhz_to_rad_s, slice_propagators, chain_product
+from pulse_calibration import FULL_SCALE_RABI_MHZ
+from pulse_comparison import create_pulse
+
+
+def _brute_force(schedule, detuning_mhz):
+    """Simulate every element directly, with virtual Z applied as a real Z rotation."""
+    d = mhz_to_rad_s(detuning_mhz)
+    u = np.eye(2, dtype=complex)
+    for el in schedule:
+        if isinstance(el, VirtualZ):
+            u = rz(el.angle) @ u
+        elif isinstance(el, Delay):
+            u = rz(d * el.duration * 1e-9) @ u
+        else:
+            env = create_pulse(el.family, el.duration, **dict(el.params))
+            u = pulse_unitary(env, el.angle, el.phase, d) @ u
+    return u
+
+
+def test_matches_direct_simulation():
+    x90 = make_gate('gaussian', np.pi / 2)
+    y180 = make_gate('drag', np.pi, np.pi / 2, duration=80, beta=0.2)
+    sched = [x90, VirtualZ(0.3), y180, Delay(40), VirtualZ(-1.1), x90, make_gate('phi', np.pi / 4, 0.7)]
+    sim = SequenceSimulator(detuning_mhz=0.4)
+    assert gate_fidelity(sim.unitary(sched), _brute_force(sched, 0.4)) > 1 - 1e-10
+    assert sim.cache_size == 3
+
+
+def test_long_schedule_costs_distinct_gates():
+    x90 = make_gate('sinc')
+    sched = [x90, VirtualZ(np.pi / 2)] * 9_999
+    sim = SequenceSimulator(detuning_mhz=0.0)
+    t0 = time.time()
+    u = sim.unitary(sched)
+    assert time.time() - t0 < 2.0 and sim.cache_size == 1
+    # Z90 X90 is a 120-degree rotation, so 9999 repetitions compose to the identity
+    assert gate_fidelity(u, np.eye(2)) > 1 - 1e-8
+
+
+def test_render_samples_in_place():
+    sched = [make_gate('square', np.pi, duration=10), Delay(5), VirtualZ(np.pi / 2), make_gate('square', np.pi / 2, duration=10)]
+    buf = np.full(schedule_duration(sched), np.nan, dtype=complex)
+    out = render_samples(sched, out=buf)
+    assert out is buf and len(out) == 25
+    assert np.allclose(out[:10], 1.0) and np.allclose(out[10:15], 0)
+    assert np.allclose(out[15:], 0.5 * np.exp(-1j * np.pi / 2))
+
+
+def test_rendered_stream_reproduces_simulation():
+    sched = [make_gate('gaussian', np.pi / 2, 0.3), VirtualZ(0.8), make_gate('drag', np.pi, duration=80, beta=0.2),
+             make_gate('sinc', np.pi / 4, -1.0, duration=48)]
+    omega = 2 * np.pi * FULL_SCALE_RABI_MHZ * 1e6 * render_samples(sched)
+    u = rz(0.8) @ chain_product(slice_propagators(omega.real, omega.imag))
+    assert gate_fidelity(u, SequenceSimulator().unitary(sched)) > 1 - 1e-10
+
+
+if __name__ == "__main__":
+    tests = [test_matches_direct_simulation, test_long_schedule_costs_distinct_gates, test_render_samples_in_place,
+             test_rendered_stream_reproduces_simulation]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
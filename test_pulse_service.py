@@ -0,0 +1,93 @@
+"""
+Tests for the local pulse compute service (localhost only).
+Run with: python test_pulse_service.py
+"""
+import io
+import sys
+import json
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from pulse_service import make_server, process_batch
+from pulse_comparison import create_drag_pulse, compute_leakage_metrics, create_phi_pulse
+
+
+def _post(base, path, payload, accept='application/json'):
+    req = urllib.request.Request(base + path, data=json.dumps(payload).encode(),
+                                 headers={'Content-Type': 'application/json', 'Accept': accept})
+    with urllib.request.urlopen(req, timeout=10) as r:
+        return r.read()
+
+
+def _with_server(fn):
+    server = make_server(port=0, max_wait=0.02)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        fn(f"http://127.0.0.1:{server.server_address[1]}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_process_batch_dedupes_and_matches_reference():
+    item = {'family': 'drag', 'duration': 64, 'params': {'beta': 0.2}}
+    res = process_batch([('metrics', item), ('pulse', item), ('metrics', {'family': 'nope', 'duration': 8})])
+    lk, bw = compute_leakage_metrics(create_drag_pulse(64, 0.2))
+    assert np.isclose(res[0]['leakage_pct'], lk) and np.isclose(res[0]['bandwidth_ghz'], bw)
+    assert np.allclose(res[1]['samples'], create_drag_pulse(64, 0.2))
+    assert isinstance(res[2], ValueError)
+
+
+def test_bad_item_does_not_fail_its_batch():
+    good = {'family': 'square', 'duration': 50, 'target_angle_deg': 90, 'resolution': 10}
+    res = process_batch([('simulate', good), ('simulate', dict(good, target_angle_deg='abc')),
+                         ('simulate', dict(good, resolution='x'))])
+    assert np.isclose(res[0]['effective_angle_deg'], 180) and len(res[0]['trajectory']) == 10
+    assert isinstance(res[1], ValueError) and isinstance(res[2], ValueError)
+
+
+def test_concurrent_requests_are_coalesced():
+    def run(base):
+        items = [{'family': 'Gaussian', 'duration': 100, 'params': {'sigma_divisor': d}} for d in range(2, 10)]
+        with ThreadPoolExecutor(8) as ex:
+            outs = list(ex.map(lambda it: json.loads(_post(base, '/metrics', it)), items))
+        assert all('energy' in o['results'][0] for o in outs)
+        stats = json.loads(urllib.request.urlopen(base + '/stats').read())
+        assert stats['items'] == 8 and stats['batches'] < 8
+
+        raw = _post(base, '/pulses', {'items': [{'family': 'phi', 'duration': 160}] * 3},
+                    accept='application/octet-stream')
+        arr = np.load(io.BytesIO(raw))
+        assert arr.shape == (3, 160) and np.allclose(arr[0], create_phi_pulse(160))
+
+        sim = json.loads(_post(base, '/simulate', {'family': 'square', 'duration': 50,
+                                                   'target_angle_deg': 90, 'resolution': 10}))
+        r = sim['results'][0]
+        assert np.isclose(r['effective_angle_deg'], 180) and len(r['trajectory']) == 10
+        for bad in ({'family': 'unknown', 'duration': 10}, [{'family': 'phi', 'duration': 160}], 'phi'):
+            try:
+                _post(base, '/metrics', bad)
+            except urllib.error.HTTPError as e:
+                assert e.code == 400
+            else:
+                raise AssertionError(f"expected HTTP 400 for {bad!r}")
+    _with_server(run)
+
+
+if __name__ == "__main__":
+    tests = [test_process_batch_dedupes_and_matches_reference, test_bad_item_does_not_fail_its_batch,
+             test_concurrent_requests_are_coalesced]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
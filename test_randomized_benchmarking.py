@@ -0,0 +1,57 @@
+"""
+Unit tests for the randomized-benchmarking simulator.
+Run with: python test_randomized_benchmarking.py
+"""
+import sys
+import numpy as np
+
+from randomized_benchmarking import (
+    N_CLIFFORDS,
+    CLIFFORD_IDEAL,
+    clifford_unitaries,
+    run_rb,
+    fit_rb_decay,
+    rank_families,
+)
+from quantum_propagators import gate_fidelity
+
+
+def test_noiseless_cliffords_are_ideal():
+    assert N_CLIFFORDS == 24
+    u = clifford_unitaries('Gaussian', 160, detuning_mhz=0.0)
+    assert np.allclose(gate_fidelity(u, CLIFFORD_IDEAL), 1.0)
+    assert clifford_unitaries('gaussian', 160, detuning_mhz=0.0) is u  # cached
+    m, surv = run_rb(u, lengths=(1, 10, 100), n_sequences=50, seed=1)
+    assert np.allclose(surv, 1.0)
+    assert fit_rb_decay(m, surv)['epc'] == 0.0
+    for bad in ([0, 1], [-3], []):
+        try:
+            run_rb(u, lengths=bad, n_sequences=5)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"lengths {bad} accepted")
+
+
+def test_detuning_decay_and_ranking():
+    ranking = rank_families(detuning_mhz=0.5, amplitude_error=0.01, lengths=(1, 10, 50, 200),
+                            n_sequences=300, families=['Square', 'Gaussian'])
+    epcs = [r['epc'] for r in ranking]
+    assert epcs == sorted(epcs) and len(epcs) == 2
+    for r in ranking:
+        assert 0 < r['epc'] < 0.05
+        assert r['survival'][0] > r['survival'][-1]
+
+
+if __name__ == "__main__":
+    tests = [test_noiseless_cliffords_are_ideal, test_detuning_decay_and_ranking]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,54 @@
+"""
+Unit tests for the shared disk-backed result cache.
+Run with: python test_result_cache.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+from result_cache import ResultCache, CODE_FILES, make_key, DEFAULT_PARAMS
+from pulse_comparison import build_pulses, create_drag_pulse
+
+
+def test_key_is_content_hash():
+    assert make_key('results', {'duration': 160, 't_min': -6.0}) == make_key('results', {'t_min': -6, 'duration': 160})
+    assert make_key('results', {'duration': 160}) != make_key('results', {'duration': 170})
+    assert make_key('results', {'duration': 160}) != make_key('fig_time', {'duration': 160})
+    assert make_key('pareto', {}) != make_key('pareto', {}, CODE_FILES + ['pareto_search.py'])
+
+
+def test_shared_between_instances():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'c.sqlite')
+        params = dict(DEFAULT_PARAMS, drag_beta=0.3)
+        ResultCache(path).get_or_compute('pulses', params, lambda: build_pulses(drag_beta=0.3))
+        other = ResultCache(path)
+        r = other.get_or_compute('pulses', params, lambda: None)
+        assert other.stats()['hits'] == 1
+        assert np.allclose(r['DRAG'], create_drag_pulse(160, 0.3))
+
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as d:
+        c = ResultCache(os.path.join(d, 'c.sqlite'), max_bytes=25_000)
+        for i in range(3):
+            c.put(f'k{i}', np.zeros(1000))  # ~8 KB each
+        c.get('k0')  # k0 becomes most recent; k1 is now the LRU entry
+        c.put('k3', np.zeros(1000))
+        assert 'k1' not in c
+        assert all(k in c for k in ('k0', 'k2', 'k3'))
+
+
+if __name__ == "__main__":
+    tests = [test_key_is_content_hash, test_shared_between_instances, test_lru_eviction]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,101 @@
+"""
+Regression tests against the golden pulse snapshots (golden_snapshots.npz).
+Run with: python test_snapshot_store.py   (re-record after intended changes: python snapshot_store.py --update)
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+import pulse_comparison
+from pulse_comparison import PULSE_NAMES
+from snapshot_store import (GoldenSnapshots, SNAPSHOT_FILE, SUMMARY_FIELDS, SUMMARY_SCALE, QUANT_BITS,
+                            format_failure)
+from test_pulses_unit import EXPECTED_ENERGIES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_golden_snapshots_unchanged():
+    snapshots = GoldenSnapshots.load(os.path.join(HERE, SNAPSHOT_FILE))
+    assert len(snapshots) > 3000 and {c[0] for c in snapshots.configs} == set(PULSE_NAMES)
+    result = snapshots.verify()
+    assert not result['failures'], '\n'.join(format_failure(f) for f in result['failures'][:20])
+
+
+def test_snapshots_agree_with_expected_energies():
+    snapshots = GoldenSnapshots.load(os.path.join(HERE, SNAPSHOT_FILE))
+    energy = SUMMARY_FIELDS.index('energy')
+    for i, (family, duration, params) in enumerate(snapshots.configs):
+        if duration == 160 and family in ('Square', 'Sinc', 'Raised Cosine'):
+            assert abs(snapshots.summary[i, energy] / SUMMARY_SCALE - EXPECTED_ENERGIES[family]) < 0.01
+
+
+def test_changed_generator_reported_with_diff():
+    configs = [('DRAG', d, {'beta': b}) for d in (40, 160) for b in (0.0, 0.2)] + [('Sinc', 160, {})]
+    snapshots = GoldenSnapshots.record(configs)
+    original = pulse_comparison.PULSE_FAMILIES['DRAG']
+    pulse_comparison.PULSE_FAMILIES['DRAG'] = (lambda duration, beta, sigma_divisor:
+                                               original[0](duration, beta, sigma_divisor * 1.01), original[1])
+    try:
+        result = snapshots.verify()
+    finally:
+        pulse_comparison.PULSE_FAMILIES['DRAG'] = original
+    assert result['checked'] == 5 and len(result['failures']) == 4
+    failure = result['failures'][0]
+    assert (failure['family'], failure['duration'], failure['params']) == ('DRAG', 40, {'beta': 0.0})
+    old, new = failure['diff']['energy']
+    assert new < old and 'energy' in format_failure(failure)  # narrower Gaussian
+
+
+def _with_square(samples, fn):
+    """Run fn with the Square family temporarily generating `samples`."""
+    original = pulse_comparison.PULSE_FAMILIES['Square']
+    pulse_comparison.PULSE_FAMILIES['Square'] = (lambda duration: samples.copy(), {})
+    try:
+        return fn()
+    finally:
+        pulse_comparison.PULSE_FAMILIES['Square'] = original
+
+
+def test_rounding_flip_is_drift_but_tiny_regression_fails():
+    base = np.linspace(0.1, 0.9, 40)
+    lsb = 2.0**-QUANT_BITS
+    on_boundary = base.copy()
+    on_boundary[5] = (np.floor(base[5] / lsb) + 0.5 + 1e-6) * lsb  # rounds up by a hair
+    snapshots = _with_square(on_boundary, lambda: GoldenSnapshots.record([('Square', 40, {})]))
+    flipped = on_boundary.copy()
+    flipped[5] -= 2e-6 * lsb  # same sample, now rounding down
+    result = _with_square(flipped, snapshots.verify)
+    assert result['drift'] == 1 and result['failures'] == []
+    shifted = on_boundary.copy()
+    shifted[7] += 1e-8  # ~43 LSB off a probe point: invisible in the 1e-6 summary
+    result = _with_square(shifted, snapshots.verify)
+    assert result['drift'] == 0 and len(result['failures']) == 1
+    assert result['failures'][0]['diff'] == {} and 'below the summary' in format_failure(result['failures'][0])
+
+
+def test_save_load_roundtrip():
+    snapshots = GoldenSnapshots.record([('Gaussian', 50, {'sigma_divisor': 4.0}), ('Square', 10, {})])
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'golden.npz')
+        snapshots.save(path)
+        loaded = GoldenSnapshots.load(path)
+    assert loaded.configs == snapshots.configs and np.array_equal(loaded.summary, snapshots.summary)
+    assert np.array_equal(loaded.hashes, snapshots.hashes) and loaded.verify()['failures'] == []
+
+
+if __name__ == "__main__":
+    tests = [test_golden_snapshots_unchanged, test_snapshots_agree_with_expected_energies,
+             test_changed_generator_reported_with_diff, test_rounding_flip_is_drift_but_tiny_regression_fails,
+             test_save_load_roundtrip]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,70 @@
+"""
+Unit tests for the spectral crosstalk analyzer.
+Run with: python test_spectral_crosstalk.py
+"""
+import sys
+import numpy as np
+
+from spectral_crosstalk import dtft, zoom_spectrum, spectral_power_db, grid_neighbors, crosstalk_report
+from pulse_comparison import PULSE_FAMILIES, create_pulse
+
+
+def test_dtft_matches_fft_and_czt():
+    s = np.stack([create_pulse('gaussian', 64), create_pulse('square', 64)])
+    f = np.fft.fftfreq(64, 1e-9) / 1e9
+    assert np.allclose(dtft(s, f), np.fft.fft(s, axis=-1), atol=1e-10)
+    assert np.allclose(dtft(s, f, chunk=7), dtft(s, f))
+    freqs, z = zoom_spectrum(s, -0.4, 0.35, 301)
+    assert np.allclose(z, dtft(s, freqs), atol=1e-9)
+    assert dtft(s, np.zeros((3, 5))).shape == (2, 3, 5)
+
+
+def test_relative_levels():
+    sq = create_pulse('square', 40)
+    db = spectral_power_db(sq, [0.0, 0.025, 0.0375])
+    assert abs(db[0]) < 1e-9           # DC reference
+    assert db[1] < -200                # sinc null at 1/T
+    assert np.isclose(db[2], 20 * np.log10(abs(np.sin(1.5 * np.pi) / (40 * np.sin(1.5 * np.pi / 40)))), atol=1e-9)
+
+
+def test_report_on_lattice():
+    plan = np.array([5.0, 5.07, 4.93, 5.16])
+    nb = grid_neighbors(2, 2)
+    assert nb.sum() == 8 and not nb[0, 3]
+    s = np.stack([create_pulse('gaussian', 40), create_pulse('square', 40)])
+    r = crosstalk_report(s, plan, nb, anharmonicity_mhz=-310)
+    assert r['neighbor_db'].shape == (2, 4, 4) and np.isnan(r['neighbor_db'][0, 0, 3])
+    assert np.isclose(r['neighbor_db'][1, 0, 1], spectral_power_db(s[1], 0.07))
+    assert np.isclose(r['leakage_12_db'][0, 2], spectral_power_db(s[0], -0.31))
+    assert np.isclose(r['spectator_12_db'][1, 0], max(spectral_power_db(s[1], [0.07 - 0.31, -0.07 - 0.31])))
+    worst = r['worst_neighbor'][1, 0]
+    assert np.isclose(r['worst_neighbor_db'][1, 0], r['neighbor_db'][1, 0, worst])
+    # the smooth pulse keeps every hazard below the square pulse
+    assert np.all(r['worst_neighbor_db'][0] < r['worst_neighbor_db'][1])
+    assert np.all(r['leakage_12_db'][0] < r['leakage_12_db'][1])
+    with np.errstate(all='raise'):
+        silent = crosstalk_report(np.zeros((1, 40)), [5.0, 5.1])
+    assert np.all(silent['worst_neighbor_db'] == -300) and np.all(silent['leakage_12_db'] == -300)
+
+
+def test_hundred_qubit_chip_at_once():
+    rng = np.random.default_rng(1)
+    plan = rng.uniform(4.8, 5.3, 100)
+    s = np.stack([create_pulse(f, 160) for f in PULSE_FAMILIES])
+    r = crosstalk_report(s, plan, anharmonicity_mhz=rng.uniform(-340, -300, 100))
+    assert r['neighbor_db'].shape == (len(PULSE_FAMILIES), 100, 100)
+    assert np.all(r['worst_neighbor'] >= 0)
+
+
+if __name__ == "__main__":
+    tests = [test_dtft_matches_fft_and_czt, test_relative_levels, test_report_on_lattice, test_hundred_qubit_chip_at_once]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,66 @@
+"""
+Unit tests for the batched two-qubit crosstalk simulator.
+Run with: python test_two_qubit_crosstalk.py
+"""
+import sys
+import numpy as np
+
+from pulse_comparison import create_gaussian_pulse, create_square_pulse
+from quantum_propagators import rotation_rates, mhz_to_rad_s
+from two_qubit_crosstalk import (
+    two_qubit_propagators,
+    crosstalk_metrics,
+    crosstalk_scan,
+    computational_indices,
+    _operators,
+    _free_energies,
+)
+
+
+def test_uncoupled_is_ideal():
+    u = two_qubit_propagators(create_gaussian_pulse(40), np.pi / 2, 5.0, [5.1, 5.3], 0.0, 0.0, levels=2)
+    m = crosstalk_metrics(u)
+    assert u.shape == (2, 4, 4)
+    assert np.allclose(m['fidelity'], 1) and np.allclose(m['spectator_error'], 0, atol=1e-12)
+
+
+def test_spectator_flip_matches_first_order():
+    s, lam, det = create_gaussian_pulse(40), 0.05, 120.0
+    m = crosstalk_metrics(two_qubit_propagators(s, np.pi / 2, 5.0, 5.0 + det * 1e-3, 0.0, lam))
+    t = (np.arange(40) + 0.5) * 1e-9
+    amp = lam / 2 * np.sum(rotation_rates(s, np.pi / 2) * np.exp(2j * np.pi * det * 1e6 * t)) * 1e-9
+    assert np.isclose(m['spectator_error'], abs(amp)**2, rtol=0.1)
+
+
+def test_static_zz_phase():
+    levels, j, f2 = 3, 5.0, 5.1
+    m = crosstalk_metrics(two_qubit_propagators(create_square_pulse(40), 0.0, 5.0, f2, j, 0.0, levels=levels),
+                          0.0, levels)
+    a1, a2 = _operators(levels)
+    h = np.diag(_free_energies(levels, 5.0, f2, 5.0, -330.0)) + mhz_to_rad_s(j) * (a1.conj().T @ a2 + a2.conj().T @ a1)
+    w, v = np.linalg.eigh(h)
+    e = w[[np.argmax(np.abs(v[k])) for k in computational_indices(levels)]]
+    assert np.isclose(m['conditional_phase'], -(e[0] - e[1] - e[2] + e[3]) * 40e-9, rtol=0.05)
+
+
+def test_scan_shapes_and_smoother_pulse_wins():
+    det = np.linspace(80, 140, 13)
+    gauss = crosstalk_scan('gaussian', 40, det)
+    square = crosstalk_scan('square', 40, det)
+    assert gauss['spectator_error'].shape == (13,) and np.all(gauss['leakage'] >= -1e-12)
+    assert np.mean(gauss['spectator_error']) < np.mean(square['spectator_error'])
+
+
+if __name__ == "__main__":
+    tests = [test_uncoupled_is_ideal, test_spectator_flip_matches_first_order, test_static_zz_phase,
+             test_scan_shapes_and_smoother_pulse_wins]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared stage memo and the background warmer.
+Run with: python test_warmup.py
+"""
+import sys
+import time
+import numpy as np
+
+from dataflow import Dataflow, pulse_graph
+from pulse_comparison import PULSE_NAMES
+from result_cache import DEFAULT_PARAMS
+from warmup import StageMemo, Warmer, neighbor_configs
+
+
+def test_memo_evicts_least_recently_used():
+    memo = StageMemo(max_bytes=3 * 800)
+    for k in 'abc':
+        memo.get_or_compute(k, lambda: np.zeros(100))
+    memo.get_or_compute('a', lambda: None)  # hit: 'a' becomes most recent
+    memo.get_or_compute('d', lambda: np.zeros(100))
+    assert 'a' in memo and 'b' not in memo and 'd' in memo
+    s = memo.stats()
+    assert (s['hits'], s['misses'], s['evictions'], s['entries']) == (1, 4, 1, 3)
+    assert s['bytes'] <= s['max_bytes']
+
+
+def test_neighbor_configs_respect_bounds():
+    steps = {'duration': (10, 500, 10), 'drag_beta': (0.0, 0.5, 0.05)}
+    configs = neighbor_configs({'duration': 10, 'drag_beta': 0.1, 'visible': ('DRAG',)}, steps)
+    assert [(c['duration'], c['drag_beta']) for c in configs] == [(20, 0.1), (10, 0.05), (10, 0.15)]
+    assert all(isinstance(c['duration'], int) and c['visible'] == ('DRAG',) for c in configs)
+
+
+def test_graphs_share_memo():
+    memo = StageMemo()
+    first, second = pulse_graph(memo=memo), pulse_graph(memo=memo)
+    for g in (first, second):
+        g.set_params(**DEFAULT_PARAMS)
+        g.get_many('leakage', PULSE_NAMES)
+    assert first.executed and not second.executed
+    assert second.reused == [f'leakage:{n}' for n in PULSE_NAMES]  # upstream stages are never resolved
+    for n in PULSE_NAMES:
+        assert np.allclose(first.get(f'leakage:{n}'), second.get(f'leakage:{n}'))
+    # A node opted out of sharing always runs in its own graph, but only when a shared consumer misses
+    graphs = [Dataflow(memo), Dataflow(memo)]
+    for g in graphs:
+        g.add('fig', lambda a: [a], ['a'], shared=False)
+        g.add('png', lambda fig, dpi: (fig[0], dpi), ['fig', 'dpi'])
+        g.set_params(a=1, dpi=72)
+        g.get('png')
+    assert graphs[0].executed == ['fig', 'png'] and graphs[1].executed == [] and graphs[1].reused == ['png']
+    graphs[1].set_params(dpi=96)
+    assert graphs[1].get('png') == (1, 96) and graphs[1].executed == ['fig', 'png']
+
+
+def test_warmer_fills_memo_for_defaults_and_neighbors():
+    memo = StageMemo()
+    steps = {'duration': (10, 500, 10)}
+    warmer = Warmer(lambda m: pulse_graph(['DRAG'], m), memo, ['leakage:DRAG'],
+                    dict(DEFAULT_PARAMS, duration=40), idle_sec=0.05, steps=steps)
+    warmer.start()
+    deadline = time.time() + 30
+    while warmer.warmed < 3 and time.time() < deadline:
+        time.sleep(0.05)
+    assert warmer.warmed == 3 and warmer.pending() == 0
+    assert memo.stats()['hits'] == memo.stats()['misses'] == 0  # warming is not counted
+    # A visitor's graph now finds a neighbor configuration ready
+    g = pulse_graph(['DRAG'], memo)
+    g.set_params(**dict(DEFAULT_PARAMS, duration=50))
+    g.get('leakage:DRAG')
+    assert g.executed == [] and 'leakage:DRAG' in g.reused
+
+
+def test_touch_postpones_warming():
+    calls = []
+
+    class Graph:
+        def set_params(self, **params):
+            calls.append(params['x'])
+
+        def get(self, target):
+            return None
+
+    warmer = Warmer(lambda m: Graph(), StageMemo(), ['t'], {'x': 0}, idle_sec=0.3, steps={'x': (0, 10, 1)})
+    warmer.touch()
+    warmer.start()
+    for _ in range(5):
+        time.sleep(0.1)
+        warmer.touch({'x': 5})
+    assert calls == []
+    deadline = time.time() + 10
+    while len(calls) < 4 and time.time() < deadline:
+        time.sleep(0.05)
+    assert calls[:2] == [4, 6] and sorted(calls) == [0, 1, 4, 6]  # latest neighbors first
+
+
+if __name__ == "__main__":
+    tests = [test_memo_evicts_least_recently_used, test_neighbor_configs_respect_bounds, test_graphs_share_memo,
+             test_warmer_fills_memo_for_defaults_and_neighbors, test_touch_postpones_warming]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
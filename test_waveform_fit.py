@@ -0,0 +1,72 @@
+"""
+Unit tests for waveform family/parameter fitting.
+Run with: python test_waveform_fit.py
+"""
+import sys
+import time
+import numpy as np
+
+from waveform_fit import WaveformFitter, random_captures
+from pulse_comparison import create_pulse
+
+CASES = [
+    ('Phi (Golden Ratio)', {'t_min': -7.3, 't_max': 2.45}),
+    ('Gaussian', {'sigma_divisor': 6.7}),
+    ('DRAG', {'beta': 0.37, 'sigma_divisor': 4.2}),
+    ('Square', {}),
+    ('Sinc', {}),
+    ('Raised Cosine', {}),
+    ('Gaussian Square', {'flat_fraction': 0.62}),
+]
+
+
+def test_recovers_family_and_parameters():
+    captures = np.stack([0.7 * create_pulse(f, 80, **p) for f, p in CASES])
+    fits = WaveformFitter().fit(captures)
+    for (family, params), fit in zip(CASES, fits):
+        assert fit['family'] == family, (family, fit['family'])
+        assert fit['correlation'] > 1 - 1e-9 and abs(fit['amplitude'] - 0.7) < 1e-6
+        model = create_pulse(family, 80, **fit['params'])
+        assert np.allclose(model, create_pulse(family, 80, **params), atol=1e-6)
+        if family != 'Gaussian Square':  # flat_fraction is only defined to within one sample step
+            assert all(abs(fit['params'][k] - v) < 1e-4 for k, v in params.items()), fit['params']
+
+
+def test_mixed_lengths_keep_order():
+    captures = [create_pulse('drag', 40, beta=0.3, sigma_divisor=3), create_pulse('square', 100),
+                create_pulse('raised_cosine', 40), 2 * create_pulse('sinc', 100)]
+    fits = WaveformFitter().fit(captures)
+    assert [f['family'] for f in fits] == ['DRAG', 'Square', 'Raised Cosine', 'Sinc']
+    assert abs(fits[3]['amplitude'] - 2) < 1e-9
+    # Without refinement the best bank entries are reported
+    coarse = WaveformFitter(refine_families=0).fit(captures)
+    assert [f['family'] for f in coarse] == ['DRAG', 'Square', 'Raised Cosine', 'Sinc']
+    assert coarse[0]['correlation'] <= fits[0]['correlation'] + 1e-12
+
+
+def test_noisy_batch_throughput():
+    truth, captures = random_captures(1000, duration=160, noise=0.01, seed=4)
+    fitter = WaveformFitter()
+    t0 = time.time()
+    fits = fitter.fit(captures)
+    assert time.time() - t0 < 20.0  # well above a thousand captures per minute
+    # Families overlap (a symmetric Phi window is a Gaussian), so compare the fitted shapes
+    for t, f in zip(truth, fits):
+        a = create_pulse(t['family'], 160, **t['params'])
+        b = create_pulse(f['family'], 160, **f['params'])
+        assert a @ b / np.linalg.norm(a) / np.linalg.norm(b) > 0.999
+        assert abs(f['amplitude'] / t['amplitude'] - 1) < 0.05
+
+
+if __name__ == "__main__":
+    tests = [test_recovers_family_and_parameters, test_mixed_lengths_keep_order, test_noisy_batch_throughput]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
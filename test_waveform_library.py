@@ -0,0 +1,88 @@
+"""
+Unit tests for the batched waveform library export (no qiskit needed).
+Run with: python test_waveform_library.py
+"""
+import os
+import sys
+import tempfile
+import types
+import numpy as np
+
+import export_qiskit_waveform as ew
+from pulse_comparison import create_phi_pulse, create_gaussian_pulse
+
+
+def _stub_qiskit_pulse():
+    """Minimal stand-in for qiskit.pulse with the names the exporter uses."""
+    qp = types.SimpleNamespace()
+
+    class Waveform:
+        def __init__(self, samples, name=None, limit_amplitude=True):
+            self.samples, self.name = np.asarray(samples), name
+
+    class ScheduleBlock:
+        def __init__(self, name=None):
+            self.name, self.blocks = name, []
+
+        def append(self, inst):
+            self.blocks.append(inst)
+
+    qp.Waveform = Waveform
+    qp.ScheduleBlock = ScheduleBlock
+    qp.Play = lambda wf, ch: ('play', wf, ch)
+    qp.DriveChannel = lambda i: ('d', i)
+    return qp
+
+
+def test_library_roundtrip_batches():
+    """Dict and (names, array) batches land in one file and load back exactly."""
+    batch2 = (['g0', 'g1'], np.stack([create_gaussian_pulse(40), 0.5 * create_gaussian_pulse(40)]))
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'lib.npz')
+        ew.export_waveform_library([{'phi': create_phi_pulse(160)}, batch2], path=path)
+        lib = ew.load_waveform_library(path)
+    assert list(lib) == ['phi', 'g0', 'g1']
+    assert np.allclose(lib['phi'], create_phi_pulse(160))
+    assert np.allclose(lib['g1'], 0.5 * create_gaussian_pulse(40))
+
+
+def test_library_rejects_overdriven_waveform():
+    with tempfile.TemporaryDirectory() as d:
+        try:
+            ew.export_waveform_library([{'ok': np.ones(8), 'bad': 2 * np.ones(8)}],
+                                       path=os.path.join(d, 'lib.npz'))
+        except ValueError as e:
+            assert 'bad' in str(e) and 'ok' not in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_schedule_bundle_with_stub():
+    """Schedules are built from the cached qiskit.pulse module (stubbed here)."""
+    saved = ew._qiskit_pulse
+    ew._qiskit_pulse = _stub_qiskit_pulse()
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            _, bundle = ew.export_waveform_library(
+                [{'a': np.ones(4), 'b': np.zeros(6)}], path=os.path.join(d, 'lib.npz'),
+                schedules=True, channel=2)
+    finally:
+        ew._qiskit_pulse = saved
+    assert set(bundle) == {'a', 'b'}
+    _, wf, ch = bundle['b'].blocks[0]
+    assert ch == ('d', 2) and len(wf.samples) == 6
+
+
+if __name__ == "__main__":
+    tests = [test_library_roundtrip_batches, test_library_rejects_overdriven_waveform,
+             test_schedule_bundle_with_stub]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
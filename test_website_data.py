@@ -0,0 +1,46 @@
+"""
+Tests for the chunked website dataset build.
+Run with: python test_website_data.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+from build_website_data import build_dataset, load_chunk
+from pulse_comparison import create_drag_pulse, compute_leakage_metrics
+
+GRID = {'DRAG': {'beta': [0.0, 0.2]}}
+
+
+def test_build_roundtrip_and_incremental():
+    with tempfile.TemporaryDirectory() as d:
+        manifest, rebuilt = build_dataset(d, durations=[40, 160], grid=GRID, workers=1)
+        assert rebuilt == 14 and len(manifest['chunks']) == 14
+        entry = manifest['chunks']['drag/160']
+        assert entry['params'] == [[0.0], [0.2]]
+        c = load_chunk(d, entry)
+        assert np.allclose(c['samples'][1], create_drag_pulse(160, 0.2), atol=1e-6)
+        lk, bw = compute_leakage_metrics(create_drag_pulse(160, 0.2))
+        assert np.allclose(c['metrics'][1], [np.sum(create_drag_pulse(160, 0.2)**2), lk, bw], rtol=1e-5)
+
+        _, rebuilt = build_dataset(d, durations=[40, 160], grid=GRID, workers=1)
+        assert rebuilt == 0
+        _, rebuilt = build_dataset(d, durations=[40, 160], grid={'DRAG': {'beta': [0.1]}}, workers=1)
+        assert rebuilt == 2
+        manifest, _ = build_dataset(d, durations=[40], grid=GRID, workers=1)
+        assert not os.path.exists(os.path.join(d, 'drag_160.bin'))
+
+
+if __name__ == "__main__":
+    tests = [test_build_roundtrip_and_incremental]
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"PASS: {t.__name__}")
+        except Exception as e:
+            print(f"FAIL: {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{failed} failed, {len(tests) - failed} passed")
+    sys.exit(failed)
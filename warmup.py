@@ -0,0 +1,237 @@
+"""
+Background warm-up for the Streamlit app.
+StageMemo is a process-wide, byte-budgeted LRU memo shared by every session's dataflow graph (see
+dataflow.Dataflow). A Warmer thread owns a private graph on the same memo and, whenever the app has been
+idle for a moment, evaluates it for the configurations a visitor is likely to pick next: the defaults,
+then every slider one step away from the configuration last seen. Its thread runs at the lowest OS
+priority where supported. warm_disk_cache() fills the shared result cache (default IBM sweep); the app
+starts it once per server process, in the background, when the first session opens.
+Run: python warmup.py   (warms the disk cache ahead of time)
+"""
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from result_cache import DEFAULT_PARAMS
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+IDLE_SEC = 1.5  # app inactivity required before the warmer computes
+# App slider (min, max, step) for each parameter warmed at neighboring values.
+SLIDER_STEPS = {
+    'duration': (10, 500, 10),
+    't_min': (-10.0, 0.0, 0.5),
+    't_max': (0.0, 10.0, 0.5),
+    'sigma_divisor': (2, 15, 1),
+    'drag_beta': (0.0, 0.5, 0.05),
+    'target_angle_deg': (0, 180, 15),
+    'bloch_resolution': (10, 500, 10),
+}
+
+
+def _nbytes(value):
+    """Approximate memory held by a cached value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_nbytes(k) + _nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class StageMemo:
+    """Thread-safe LRU {key: value} evicting least recently used entries above max_bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute, count=True):
+        """Cached value for key, else compute() and store it. count=False leaves the hit/miss metrics alone."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return self._entries[key][0]
+            self.misses += count
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        size = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.bytes -= dropped
+                self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions, 'hit_rate': self.hits / total if total else 0.0}
+
+
+def neighbor_configs(params, steps=SLIDER_STEPS):
+    """Configurations one slider step away from params (within slider bounds), in SLIDER_STEPS order."""
+    out = []
+    for name, (lo, hi, step) in steps.items():
+        if name not in params:
+            continue
+        for direction in (-1, 1):
+            value = round(params[name] + direction * step, 9)
+            if lo <= value <= hi:
+                out.append(dict(params, **{name: type(params[name])(value)}))
+    return out
+
+
+class _UncountedView:
+    """The warmer's handle on a StageMemo: its own lookups do not count towards the visitors' hit rate."""
+
+    def __init__(self, memo):
+        self.memo = memo
+
+    def get_or_compute(self, key, compute):
+        return self.memo.get_or_compute(key, compute, count=False)
+
+
+def _lower_thread_priority():
+    """Lowest scheduling priority for the calling thread (Linux: per-thread nice); no-op elsewhere."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class Warmer(threading.Thread):
+    """
+    Daemon thread evaluating `targets` of a private graph (graph_factory(memo)) for queued configurations,
+    only while the app is idle. touch(params) marks activity and queues the neighbors of params.
+    """
+
+    def __init__(self, graph_factory, memo, targets, defaults, idle_sec=IDLE_SEC, steps=SLIDER_STEPS):
+        super().__init__(name='warmup', daemon=True)
+        self.graph_factory = graph_factory
+        self.memo = memo
+        self.targets = list(targets)
+        self.idle_sec = idle_sec
+        self.steps = steps
+        self.warmed = 0
+        self.seconds = 0.0
+        self._queue = [dict(defaults)] + neighbor_configs(defaults, steps)
+        self._seen = set()
+        self._last_activity = 0.0
+        self._last_params = None
+        self._wake = threading.Condition()
+
+    def touch(self, params=None):
+        """Called on every app rerun: postpones warming and queues neighbors of a new configuration."""
+        with self._wake:
+            self._last_activity = time.monotonic()
+            if params is not None and params != self._last_params:
+                self._last_params = dict(params)
+                self._queue[:0] = neighbor_configs(params, self.steps)
+            self._wake.notify()
+
+    def pending(self):
+        with self._wake:
+            return len(self._queue)
+
+    def _next(self):
+        """Block until there is queued work and the app has been idle for idle_sec; return a config."""
+        with self._wake:
+            while True:
+                while self._queue and _key(self._queue[0]) in self._seen:
+                    self._queue.pop(0)
+                idle = time.monotonic() - self._last_activity
+                if self._queue and idle >= self.idle_sec:
+                    config = self._queue.pop(0)
+                    self._seen.add(_key(config))
+                    return config
+                self._wake.wait(self.idle_sec - idle if self._queue else None)
+
+    def _wait_idle(self):
+        with self._wake:
+            while (idle := time.monotonic() - self._last_activity) < self.idle_sec:
+                self._wake.wait(self.idle_sec - idle)
+
+    def run(self):
+        _lower_thread_priority()
+        graph = self.graph_factory(_UncountedView(self.memo))
+        while True:
+            config = self._next()
+            graph.set_params(**config)
+            for target in self.targets:
+                self._wait_idle()  # yield to visitors between stages too
+                t0 = time.perf_counter()
+                try:
+                    graph.get(target)
+                except Exception:  # a failing stage must not stop warming the others
+                    pass
+                self.seconds += time.perf_counter() - t0
+            self.warmed += 1
+
+    def stats(self):
+        return dict(self.memo.stats(), warmed_configs=self.warmed, pending_configs=self.pending(),
+                    warm_seconds=self.seconds)
+
+
+def _key(params):
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+def warm_disk_cache(cache=None, low_priority=True):
+    """
+    The default IBM gate-length sweep in the shared result cache. Returns its records. (The app drives on
+    resonance, where calibration tables need no build: see pulse_calibration.cached_tables.)
+    """
+    from result_cache import ResultCache
+    from gate_length_sweep import cached_sweep
+    if low_priority:
+        _lower_thread_priority()
+    cache = cache or ResultCache()
+    return cached_sweep(cache, **{k: v for k, v in DEFAULT_PARAMS.items() if k != 'duration'})
+
+
+def start_disk_warmup(cache=None):
+    """
+    warm_disk_cache() on a low-priority background thread. Returns its Future, so one process never warms
+    twice and callers never wait for it.
+    """
+    executor = ThreadPoolExecutor(1, thread_name_prefix='warmup-disk')
+    future = executor.submit(warm_disk_cache, cache)
+    executor.shutdown(wait=False)
+    return future
+
+
+if __name__ == "__main__":
+    from result_cache import ResultCache
+    t0 = time.time()
+    c = ResultCache()
+    warm_disk_cache(c, low_priority=False)
+    print(f"Warmed {c.path} in {time.time() - t0:.1f} s: {c.stats()}")
@@ -0,0 +1,112 @@
+// Lazy loader and explorer for the static dataset written by build_website_data.py.
+// data/manifest.json indexes one float32 chunk per (family, duration); chunks are fetched on demand.
+const PulseData = (() => {
+    const base = 'data/';
+    let manifestPromise = null;
+    const chunks = new Map();
+
+    function manifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetch(base + 'manifest.json').then(r => {
+                if (!r.ok) throw new Error('manifest.json not found (run build_website_data.py)');
+                return r.json();
+            });
+        }
+        return manifestPromise;
+    }
+
+    async function chunk(familyKey, duration) {
+        const id = familyKey + '/' + duration;
+        if (!chunks.has(id)) {
+            chunks.set(id, (async () => {
+                const m = await manifest();
+                const entry = m.chunks[id];
+                if (!entry) throw new Error('No data for ' + id);
+                const buf = await (await fetch(base + entry.file)).arrayBuffer();
+                const out = { params: entry.params, paramNames: m.families[familyKey].param_names };
+                for (const [name, b] of Object.entries(entry.blocks)) {
+                    const [rows, cols] = b.shape;
+                    const all = new Float32Array(buf, b.offset, rows * cols);
+                    out[name] = Array.from({ length: rows }, (_, i) => all.subarray(i * cols, (i + 1) * cols));
+                }
+                out.freqs = frequencies(duration, m.sample_rate_gs);
+                return out;
+            })());
+        }
+        return chunks.get(id);
+    }
+
+    // fftshift(fftfreq(n, 1/fs)) in GHz
+    function frequencies(n, fs) {
+        const f = new Float32Array(n);
+        const start = -Math.floor(n / 2);
+        for (let i = 0; i < n; i++) f[i] = (start + i) * fs / n;
+        return f;
+    }
+
+    return { manifest, chunk };
+})();
+
+function drawSeries(canvas, xs, ys, yMin, yMax, color) {
+    const ctx = canvas.getContext('2d');
+    const w = canvas.width, h = canvas.height, pad = 24;
+    ctx.clearRect(0, 0, w, h);
+    ctx.strokeStyle = '#ccc';
+    ctx.strokeRect(pad, pad / 2, w - 1.5 * pad, h - 1.5 * pad);
+    const xMin = xs[0], xMax = xs[xs.length - 1];
+    const px = x => pad + (x - xMin) / (xMax - xMin || 1) * (w - 1.5 * pad);
+    const py = y => pad / 2 + (1 - (Math.max(yMin, Math.min(yMax, y)) - yMin) / (yMax - yMin)) * (h - 1.5 * pad);
+    ctx.strokeStyle = color;
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    for (let i = 0; i < ys.length; i++) {
+        i ? ctx.lineTo(px(xs[i]), py(ys[i])) : ctx.moveTo(px(xs[i]), py(ys[i]));
+    }
+    ctx.stroke();
+}
+
+async function initExplorer() {
+    const root = document.getElementById('explorer');
+    if (!root) return;
+    const famSel = root.querySelector('#explorer-family');
+    const durSel = root.querySelector('#explorer-duration');
+    const parSel = root.querySelector('#explorer-params');
+    const info = root.querySelector('#explorer-metrics');
+    let m;
+    try {
+        m = await PulseData.manifest();
+    } catch (e) {
+        info.textContent = e.message;
+        return;
+    }
+    for (const [key, fam] of Object.entries(m.families)) famSel.add(new Option(fam.name, key));
+    for (const d of m.durations) durSel.add(new Option(d + ' ns', d));
+    durSel.value = m.durations.includes(160) ? 160 : m.durations[0];
+
+    async function loadChunk() {
+        const c = await PulseData.chunk(famSel.value, durSel.value);
+        const prev = parSel.value;
+        parSel.innerHTML = '';
+        c.params.forEach((p, i) => parSel.add(new Option(
+            c.paramNames.length ? c.paramNames.map((n, j) => n + '=' + p[j]).join(', ') : 'default', i)));
+        if (prev && prev < c.params.length) parSel.value = prev;
+        render(c);
+    }
+
+    async function render(c) {
+        c = c || await PulseData.chunk(famSel.value, durSel.value);
+        const i = Number(parSel.value) || 0;
+        const t = Array.from(c.samples[i], (_, k) => k);
+        drawSeries(root.querySelector('#explorer-time'), t, c.samples[i], -0.2, 1.05, '#e65100');
+        drawSeries(root.querySelector('#explorer-psd'), c.freqs, c.psd[i], -100, 5, '#1565c0');
+        const [energy, leak, bw] = c.metrics[i];
+        info.textContent = `Energy ${energy.toFixed(2)} | High-freq leakage ${leak.toFixed(4)}% | Bandwidth (-40 dB) ${bw.toFixed(4)} GHz`;
+    }
+
+    famSel.addEventListener('change', () => { parSel.value = ''; loadChunk(); });
+    durSel.addEventListener('change', loadChunk);
+    parSel.addEventListener('change', () => render());
+    loadChunk();
+}
+
+document.addEventListener('DOMContentLoaded', initExplorer);